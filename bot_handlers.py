@@ -4,9 +4,12 @@ import asyncio
 import datetime
 import gc
 import logging
-import os
+import re
 from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
 from io import BytesIO
+from pathlib import Path
 
 from telegram import (
     InlineKeyboardButton,
@@ -17,6 +20,7 @@ from telegram import (
 )
 from telegram.ext import (
     Application,
+    BaseUpdateProcessor,
     CallbackQueryHandler,
     CommandHandler,
     ContextTypes,
@@ -48,6 +52,7 @@ from config import (
     CHANNEL_ID,
     CHANNEL_URL,
     CHAR_LIMIT,
+    CONCURRENT_UPDATES,
     DAILY_HADITH_COUNT,
     DAILY_HADITH_HOURS,
     DATA_DIR,
@@ -64,14 +69,22 @@ from config import (
     IMAGE_DEFAULT_BG,
     IMAGE_DEFAULT_FONT,
     MAX_AYAS_PER_REQUEST,
+    MEDIA_WORKERS,
     OUTPUT_DIR,
     PAGE_SOURCES,
     TAFSIR_SOURCES,
     VIDEO_DEFAULT_BG,
     VIDEO_DEFAULT_FONT,
     VIDEO_DEFAULT_RATIO,
+    VOICE_KEYS,
     VOICES,
+    WEBHOOK_LISTEN,
+    WEBHOOK_PATH,
+    WEBHOOK_PORT,
+    WEBHOOK_SECRET,
+    WEBHOOK_URL,
     aud_fid_key,
+    doc_fid_key,
     img_fid_key,
     vid_fid_key,
 )
@@ -81,6 +94,7 @@ from core.data import (
     get_sura_display_name,
     get_sura_name,
     get_sura_start_index,
+    get_sura_verses,
     load_quran_data,
     load_quran_text,
     load_quran_text_simple,
@@ -88,10 +102,10 @@ from core.data import (
 )
 from core.database import (
     get_db_user,
-    get_session,
     get_stats,
     increment_stat,
     init_db,
+    session_scope,
     update_user_field,
 )
 from core.hadith import format_hadith, get_random_hadith
@@ -100,17 +114,21 @@ from core.lang import t
 from core.mushaf import send_mushaf_page
 from core.nlu import parse_message
 from core.queue import QueueItem, request_queue
-from core.search import make_snippet, search
+from core.search import SearchHit, make_snippet, search
 from core.subtitles import get_verse_durations
-from core.tafsir import get_tafsir
+from core.tafsir import get_tafsir, get_tafsir_range, purge_expired_tafsir
 from core.utils import (
+    NEXT_ARROW,
+    PREV_ARROW,
     check_and_purge_storage,
+    debounced_edit,
     file_id_count,
     get_file_id,
     get_free_mb,
     is_rate_limited,
     log_error,
     make_progress_cb,
+    nav_button,
     safe_filename,
     set_file_id,
 )
@@ -129,7 +147,9 @@ logging.basicConfig(format="%(asctime)s %(name)s %(levelname)s %(message)s", lev
 logging.getLogger("httpx").setLevel(logging.WARNING)
 logger = logging.getLogger(__name__)
 
-_WORKER_POOL = ThreadPoolExecutor(max_workers=2)
+# Single bounded pool for all CPU-heavy media work (ffmpeg, ffprobe, PIL) so a
+# burst of requests cannot oversubscribe the host.
+_WORKER_POOL = ThreadPoolExecutor(max_workers=MEDIA_WORKERS, thread_name_prefix="media")
 quran_data    = None
 verses        = None        # Uthmani text — video rendering
 simple_verses = None        # Simple text — display, search, subtitles
@@ -174,10 +194,46 @@ def _sura_title(sura, lang, start, end=None) -> str:
         return name
     return f"{name} ({start}-{end})"
 
+# Verse callbacks: "<action>_{sura}_{start}[_{end}[_{extra}...]]", where the action
+# may itself contain underscores (verse_back_, textpage_ …).
+_CB_RANGE = re.compile(r"^[a-z_]+?_(\d+)_(\d+)((?:_\d+)*)$")
+
+def _cb_range(data: str) -> tuple[int, int, int, list[int]] | None:
+    """Parse a verse callback into (sura, start, end, extras); end defaults to start."""
+    m = _CB_RANGE.match(data or "")
+    if not m: return None
+    sura, start = int(m[1]), int(m[2])
+    rest        = [int(x) for x in m[3].split("_")[1:]]
+    end         = rest.pop(0) if rest else start
+    return sura, start, end, rest
+
 def _verse_char_len(sura: int, start: int, end: int) -> int:
     """Total char length of verse display text (simple)."""
-    idx = get_sura_start_index(quran_data, sura)
-    return sum(len(verses[idx + i - 1]) for i in range(start, end + 1))
+    return sum(map(len, get_sura_verses(quran_data, verses, sura, start, end)))
+
+
+# ---------------------------------------------------------------------------
+# Callback acknowledgement
+# ---------------------------------------------------------------------------
+
+_bg_tasks: set[asyncio.Task] = set()
+
+def _spawn(coro) -> None:
+    """Run a fire-and-forget coroutine, keeping a reference until it finishes."""
+    task = asyncio.create_task(coro)
+    _bg_tasks.add(task)
+    task.add_done_callback(_bg_tasks.discard)
+
+def _ack(query) -> None:
+    """Answer a pure-navigation callback without awaiting the round-trip.
+
+    The spinner only needs to stop eventually; the menu edit that follows is
+    what the user waits for, so it should not queue behind answerCallbackQuery.
+    """
+    async def _answer():
+        try: await query.answer()
+        except Exception: pass
+    _spawn(_answer())
 
 
 # ---------------------------------------------------------------------------
@@ -185,13 +241,12 @@ def _verse_char_len(sura: int, start: int, end: int) -> int:
 # ---------------------------------------------------------------------------
 
 async def _cycle_pref(user, key: str, options: list, default: str) -> str:
-    from core.database import update_user_preference
-    cur = user.get_preference(key, default)
-    try:    idx = options.index(cur)
-    except: idx = -1
-    new = options[(idx + 1) % len(options)]
-    await update_user_preference(user.telegram_id, key, new)
-    return new
+    from core.database import cycle_user_preference
+    return await cycle_user_preference(user.telegram_id, key, options, default)
+
+# Static menus depend only on the language (and constant config), and PTB
+# markup objects are immutable, so each one is built once and reused.
+@lru_cache(maxsize=None)
 def _welcome_keyboard(lang: str) -> InlineKeyboardMarkup:
     rows = [[
         InlineKeyboardButton(t("settings", lang), callback_data="menu_settings"),
@@ -205,45 +260,47 @@ def _welcome_keyboard(lang: str) -> InlineKeyboardMarkup:
 # Sura list
 # ---------------------------------------------------------------------------
 
+SURA_PAGE_SIZE = 20
+SURA_PAGES     = tuple(tuple(range(i, min(i + SURA_PAGE_SIZE, 115))) for i in range(1, 115, SURA_PAGE_SIZE))
+
 async def show_sura_list(update: Update, page: int = 0):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
-    user      = await get_db_user(update.effective_user)
-    lang      = user.language
-    start_idx = page * 20 + 1
-    end_idx   = min(start_idx + 20, 115)
-    keyboard  = [
+    _ack(query)
+    user = await get_db_user(update.effective_user)
+    lang = user.language
+    page = min(max(page, 0), len(SURA_PAGES) - 1)
+    debounced_edit(query, t("choose_sura", lang), reply_markup=_sura_list_keyboard(lang, page))
+
+@lru_cache(maxsize=64)
+def _sura_list_keyboard(lang: str, page: int) -> InlineKeyboardMarkup:
+    keyboard = [
         [InlineKeyboardButton(f"{i}. {get_sura_name(quran_data, i, lang)}", callback_data=f"download_{i}")]
-        for i in range(start_idx, end_idx)
+        for i in SURA_PAGES[page]
     ]
     nav = []
-    if page > 0:      nav.append(InlineKeyboardButton(t("prev", lang), callback_data=f"surapage_{page-1}"))
-    if end_idx < 115: nav.append(InlineKeyboardButton(t("next", lang), callback_data=f"surapage_{page+1}"))
+    if page > 0:                   nav.append(InlineKeyboardButton(t("prev", lang), callback_data=f"surapage_{page-1}"))
+    if page < len(SURA_PAGES) - 1: nav.append(InlineKeyboardButton(t("next", lang), callback_data=f"surapage_{page+1}"))
     if nav: keyboard.append(nav)
     keyboard.append([InlineKeyboardButton(t("back", lang), callback_data="menu_main")])
-    await query.edit_message_text(t("choose_sura", lang), reply_markup=InlineKeyboardMarkup(keyboard))
+    return InlineKeyboardMarkup(keyboard)
 
 async def download_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     try: sura = int(query.data.split("_")[1])
     except: return
     user  = await get_db_user(update.effective_user)
     lang  = user.language
     count = get_sura_aya_count(quran_data, sura)
-    clen  = _verse_char_len(sura, 1, count)
     await query.edit_message_text(
         f"📖 {get_sura_display_name(quran_data, sura, lang)}",
-        reply_markup=build_verse_keyboard(sura, 1, count, lang, quran_data, verse_char_len=clen),
+        reply_markup=build_verse_keyboard(sura, 1, count, lang, quran_data),
     )
 
 
 async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user       = await get_db_user(update.effective_user)
     lang       = user.language
     lang_lbl   = _lang_label(lang, lang)
@@ -256,8 +313,8 @@ async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         [InlineKeyboardButton(f"▪️ {t('more', lang)}", callback_data="menu_settings_other")],
         [InlineKeyboardButton(t("back", lang), callback_data="menu_main")],
     ]
-    await query.edit_message_text(
-        t("settings_title_simple", lang, language=lang_lbl, reciter=rec_name),
+    debounced_edit(
+        query, t("settings_title_simple", lang, language=lang_lbl, reciter=rec_name),
         reply_markup=InlineKeyboardMarkup(keyboard),
     )
 
@@ -268,8 +325,7 @@ async def settings_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def settings_other_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user = await get_db_user(update.effective_user)
     lang = user.language
     src        = user.get_preference("page_source", DEFAULT_PAGE_SOURCE)
@@ -288,8 +344,8 @@ async def settings_other_handler(update: Update, context: ContextTypes.DEFAULT_T
         ],
         [InlineKeyboardButton(t("back", lang), callback_data="menu_settings")],
     ]
-    await query.edit_message_text(
-        t("settings_more_title", lang, tafsir=tafsir_lbl, source=src_lbl, fmt=fmt_lbl),
+    debounced_edit(
+        query, t("settings_more_title", lang, tafsir=tafsir_lbl, source=src_lbl, fmt=fmt_lbl),
         reply_markup=InlineKeyboardMarkup(keyboard)
     )
 
@@ -300,8 +356,7 @@ async def settings_other_handler(update: Update, context: ContextTypes.DEFAULT_T
 
 async def settings_video_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user     = await get_db_user(update.effective_user)
     lang     = user.language
     ratio    = user.get_preference("video_ratio", VIDEO_DEFAULT_RATIO)
@@ -314,8 +369,8 @@ async def settings_video_handler(update: Update, context: ContextTypes.DEFAULT_T
         [InlineKeyboardButton(f"📐 {t('setting_ratio', lang)}: {_ratio_label(ratio, lang)}", callback_data="toggle_vratio")],
         [InlineKeyboardButton(t("back", lang), callback_data="menu_settings_other")],
     ]
-    await query.edit_message_text(
-        t("settings_video_title", lang,
+    debounced_edit(
+        query, t("settings_video_title", lang,
           font=_font_label(vid_font, lang), theme=_bg_label(vid_bg, lang), ratio=_ratio_label(ratio, lang)),
         reply_markup=InlineKeyboardMarkup(keyboard),
     )
@@ -327,8 +382,7 @@ async def settings_video_handler(update: Update, context: ContextTypes.DEFAULT_T
 
 async def settings_photo_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user     = await get_db_user(update.effective_user)
     lang     = user.language
     font_key = user.get_preference("img_font",       IMAGE_DEFAULT_FONT)
@@ -341,8 +395,8 @@ async def settings_photo_handler(update: Update, context: ContextTypes.DEFAULT_T
         [InlineKeyboardButton(f"📐 {t('setting_resolution', lang)}: {_res_label(res, lang)}", callback_data="list_ires_0")],
         [InlineKeyboardButton(t("back", lang), callback_data="menu_settings_other")],
     ]
-    await query.edit_message_text(
-        t("settings_photo_title", lang,
+    debounced_edit(
+        query, t("settings_photo_title", lang,
           font=_font_label(font_key, lang), theme=_bg_label(bg_key, lang), resolution=_res_label(res, lang)),
         reply_markup=InlineKeyboardMarkup(keyboard),
     )
@@ -354,8 +408,7 @@ async def settings_photo_handler(update: Update, context: ContextTypes.DEFAULT_T
 
 async def settings_list_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     parts = query.data.split("_")
     ltype = parts[1]
     try: page = int(parts[2])
@@ -432,12 +485,11 @@ async def settings_list_handler(update: Update, context: ContextTypes.DEFAULT_TY
 
     keyboard.append([InlineKeyboardButton(t("back", lang), callback_data=back_call)])
 
-    await query.edit_message_text(f"⚙️ {title}", reply_markup=InlineKeyboardMarkup(keyboard))
+    debounced_edit(query, f"⚙️ {title}", reply_markup=InlineKeyboardMarkup(keyboard))
 
 async def settings_set_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     parts = query.data.split("_")
     ltype = parts[1]
     value = "_".join(parts[2:])
@@ -479,8 +531,7 @@ async def settings_set_handler(update: Update, context: ContextTypes.DEFAULT_TYP
 
 async def settings_toggle_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user = await get_db_user(update.effective_user)
     data = query.data
 
@@ -508,39 +559,45 @@ async def settings_toggle_handler(update: Update, context: ContextTypes.DEFAULT_
 # Voice selection
 # ---------------------------------------------------------------------------
 
+VOICE_PAGE_SIZE   = 8
+VOICE_PAGES       = tuple(
+    tuple((code, VOICES[code]) for code in VOICE_KEYS[i:i + VOICE_PAGE_SIZE])
+    for i in range(0, len(VOICE_KEYS), VOICE_PAGE_SIZE)
+)
+VOICE_TOTAL_PAGES = len(VOICE_PAGES)
+
 async def voice_list_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     user  = await get_db_user(update.effective_user)
     lang  = user.language
     voice = user.voice or DEFAULT_VOICE
     try:   page = int(query.data.split("_")[-1])
     except: page = 0
-    per_page    = 8
-    all_voices  = list(VOICES.items())
-    total_pages = (len(all_voices) + per_page - 1) // per_page
-    chunk       = all_voices[page * per_page:(page + 1) * per_page]
+    page = min(max(page, 0), VOICE_TOTAL_PAGES - 1)
+    debounced_edit(
+        query, f"🎙️ {t('choose_voice', lang)} ({page+1}/{VOICE_TOTAL_PAGES})",
+        reply_markup=_voice_list_keyboard(lang, page, voice),
+    )
+
+@lru_cache(maxsize=256)
+def _voice_list_keyboard(lang: str, page: int, voice: str) -> InlineKeyboardMarkup:
     keyboard, row = [], []
-    for code, info in chunk:
+    for code, info in VOICE_PAGES[page]:
         mark = "✅ " if code == voice else ""
         row.append(InlineKeyboardButton(f"{mark}{info.get(lang, info.get('en', code))}", callback_data=f"voice_{code}"))
         if len(row) == 2: keyboard.append(row); row = []
     if row: keyboard.append(row)
     nav = []
-    if page > 0:               nav.append(InlineKeyboardButton(t("prev", lang), callback_data=f"voice_list_{page-1}"))
-    if page < total_pages - 1: nav.append(InlineKeyboardButton(t("next", lang), callback_data=f"voice_list_{page+1}"))
+    if page > 0:                     nav.append(InlineKeyboardButton(t("prev", lang), callback_data=f"voice_list_{page-1}"))
+    if page < VOICE_TOTAL_PAGES - 1: nav.append(InlineKeyboardButton(t("next", lang), callback_data=f"voice_list_{page+1}"))
     if nav: keyboard.append(nav)
     keyboard.append([InlineKeyboardButton(t("back", lang), callback_data="menu_settings")])
-    await query.edit_message_text(
-        f"🎙️ {t('choose_voice', lang)} ({page+1}/{total_pages})",
-        reply_markup=InlineKeyboardMarkup(keyboard),
-    )
+    return InlineKeyboardMarkup(keyboard)
 
 async def voice_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
+    _ack(query)
     voice = query.data[len("voice_"):]
     user  = await get_db_user(update.effective_user)
     await update_user_field(user.telegram_id, voice=voice)
@@ -553,10 +610,18 @@ async def voice_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def donate_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
-    user     = await get_db_user(update.effective_user)
-    lang     = user.language
+    _ack(query)
+    user = await get_db_user(update.effective_user)
+    lang = user.language
+    await query.edit_message_text(
+        t("donate_title", lang),
+        reply_markup=_donate_keyboard(lang),
+        parse_mode="MarkdownV2",
+        disable_web_page_preview=True,
+    )
+
+@lru_cache(maxsize=None)
+def _donate_keyboard(lang: str) -> InlineKeyboardMarkup:
     keyboard = [
         [InlineKeyboardButton(t("stars_25", lang), callback_data="stars_25"),
          InlineKeyboardButton(t("stars_50", lang), callback_data="stars_50")],
@@ -566,12 +631,7 @@ async def donate_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if DONATE_URL:
         keyboard.append([InlineKeyboardButton(t("donate_other", lang), url=DONATE_URL)])
     keyboard.append([InlineKeyboardButton(t("back", lang), callback_data="menu_main")])
-    await query.edit_message_text(
-        t("donate_title", lang),
-        reply_markup=InlineKeyboardMarkup(keyboard),
-        parse_mode="MarkdownV2",
-        disable_web_page_preview=True,
-    )
+    return InlineKeyboardMarkup(keyboard)
 
 async def stars_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
@@ -606,27 +666,29 @@ async def successful_payment_handler(update: Update, context: ContextTypes.DEFAU
 # ---------------------------------------------------------------------------
 
 async def _process_queue_item(bot, item_id: int):
-    session  = get_session()
-    result   = await session.execute(select(QueueItem).filter_by(id=item_id))
-    item     = result.scalars().first()
-    if not item: await session.close(); return
-    params   = item.params()
-    lang     = item.lang
-    chat_id  = item.chat_id
-    msg_id   = item.status_msg_id
-    req_type = item.request_type
-    await session.close()
+    async with session_scope() as session:
+        result   = await session.execute(select(QueueItem).filter_by(id=item_id))
+        item     = result.scalars().first()
+        if not item: return
+        params   = item.params()
+        lang     = item.lang
+        chat_id  = item.chat_id
+        msg_id   = item.status_msg_id
+        req_type = item.request_type
 
     loop = asyncio.get_running_loop()
 
-    async def _dot_delete():
-        if not msg_id: return
+    async def _blank_and_delete():
         try: await bot.edit_message_text(chat_id=chat_id, message_id=msg_id, text=".")
         except Exception: pass
         await asyncio.sleep(0.3)
         try: await bot.delete_message(chat_id=chat_id, message_id=msg_id)
         except Exception: pass
 
+    def _dot_delete():
+        # The blank-then-delete dance runs in the background so the upload starts right away.
+        if msg_id: _spawn(_blank_and_delete())
+
     async def _edit_pos(text, reply_markup=None):
         if not msg_id: return
         try: await bot.edit_message_text(chat_id=chat_id, message_id=msg_id, text=text, reply_markup=reply_markup)
@@ -646,7 +708,7 @@ async def _process_queue_item(bot, item_id: int):
             await bot.send_audio(chat_id=chat_id, audio=cached,
                                  title=title, performer=reciter,
                                  caption=t("audio_caption", lang, title=title, reciter=reciter))
-            await _dot_delete()
+            _dot_delete()
         else:
             await _edit_pos("🎧\n▱▱▱▱▱ 0%")
             async def _ea(text): await _edit_pos(text)
@@ -656,16 +718,16 @@ async def _process_queue_item(bot, item_id: int):
                                sura, start_aya, sura, end_aya, title=title, artist=reciter,
                                progress_cb=make_progress_cb(_ea, loop, icon="🎧"))
             mp3_path = await loop.run_in_executor(_WORKER_POOL, _gen_audio)
-            await _dot_delete()
-            with open(mp3_path, "rb") as f:
-                sent = await bot.send_audio(
-                    chat_id=chat_id, audio=f,
-                    filename=f"{safe_filename(title)}.mp3",
-                    title=title, performer=reciter,
-                    caption=t("audio_caption", lang, title=title, reciter=reciter),
-                )
-            if mp3_path and os.path.exists(mp3_path):
-                os.remove(mp3_path)
+            _dot_delete()
+            # Read off the event loop — PTB would otherwise slurp the file synchronously.
+            mp3_bytes = await asyncio.to_thread(Path(mp3_path).read_bytes)
+            sent = await bot.send_audio(
+                chat_id=chat_id, audio=mp3_bytes,
+                filename=f"{safe_filename(title)}.mp3",
+                title=title, performer=reciter,
+                caption=t("audio_caption", lang, title=title, reciter=reciter),
+            )
+            del mp3_bytes   # the MP3 stays on disk as a cache for later video requests
             if sent and sent.audio:
                 set_file_id(fid_key, sent.audio.file_id)
                 await increment_stat("generated_audio")
@@ -686,7 +748,7 @@ async def _process_queue_item(bot, item_id: int):
         if cached:
             await bot.send_video(chat_id=chat_id, video=cached,
                                  caption=t("video_caption", lang, title=title, reciter=reciter))
-            await _dot_delete()
+            _dot_delete()
         else:
             await _edit_pos("🎬\n▱▱▱▱▱ 0%")
             async def _ev(text): await _edit_pos(text)
@@ -694,9 +756,7 @@ async def _process_queue_item(bot, item_id: int):
                 check_and_purge_storage(AUDIO_DIR, OUTPUT_DIR)
                 mp3        = gen_mp3(AUDIO_DIR, OUTPUT_DIR, quran_data, reciter_code,
                                     sura, start_aya, sura, end_aya, title=title, artist=reciter)
-                start_idx  = get_sura_start_index(quran_data, sura)
-                vtexts     = [verses[start_idx + i - 1]
-                               for i in range(start_aya, end_aya + 1)]
+                vtexts     = get_sura_verses(quran_data, verses, sura, start_aya, end_aya)
                 vdurs      = get_verse_durations(AUDIO_DIR, reciter_code, sura, start_aya, end_aya)
                 return gen_video(
                     vtexts, start_aya, sura,
@@ -707,14 +767,14 @@ async def _process_queue_item(bot, item_id: int):
                     progress_cb=make_progress_cb(_ev, loop, icon="🎬"),
                 )
             video_path = await loop.run_in_executor(_WORKER_POOL, _gen_video)
-            await _dot_delete()
-            with open(video_path, "rb") as vf:
-                sent = await bot.send_video(
-                    chat_id=chat_id, video=vf,
-                    caption=t("video_caption", lang, title=title, reciter=reciter),
-                    filename=f"{safe_filename(title)}.mp4",
-                )
-            del video_path; gc.collect()
+            _dot_delete()
+            video_bytes = await asyncio.to_thread(Path(video_path).read_bytes)
+            sent = await bot.send_video(
+                chat_id=chat_id, video=video_bytes,
+                caption=t("video_caption", lang, title=title, reciter=reciter),
+                filename=f"{safe_filename(title)}.mp4",
+            )
+            del video_path, video_bytes; gc.collect()
             if sent and sent.video:
                 set_file_id(fid_key, sent.video.file_id)
                 await increment_stat("generated_video")
@@ -731,11 +791,10 @@ async def _process_queue_item(bot, item_id: int):
         fid_key    = img_fid_key(sura, start_aya, end_aya, font_key, bg_key, resolution)
         cached     = get_file_id(fid_key)
 
-        idx       = get_sura_start_index(quran_data, sura)
-        raw_pairs = [(i, verses[idx + i - 1]) for i in range(start_aya, end_aya + 1)]
+        raw_pairs = list(enumerate(get_sura_verses(quran_data, verses, sura, start_aya, end_aya), start_aya))
 
         async def _do_send(photo_src):
-            await _dot_delete()
+            _dot_delete()
             from core.verses import build_img_keyboard
             caption = f"📖 {title}"
             kb      = build_img_keyboard(sura, start_aya, end_aya, lang)
@@ -759,14 +818,13 @@ async def _process_queue_item(bot, item_id: int):
             await _do_send(bio)
 
     # Mark done or handle error
-    session = get_session()
-    result = await session.execute(select(QueueItem).filter_by(id=item_id))
-    db_item = result.scalars().first()
-    if db_item:
-        if db_item.status == "processing":
-            db_item.status = "done"
-        await session.commit()
-    await session.close()
+    async with session_scope() as session:
+        result = await session.execute(select(QueueItem).filter_by(id=item_id))
+        db_item = result.scalars().first()
+        if db_item:
+            if db_item.status == "processing":
+                db_item.status = "done"
+            await session.commit()
 
 
 async def _safe_process_queue_item(bot, item_id: int):
@@ -774,54 +832,77 @@ async def _safe_process_queue_item(bot, item_id: int):
         await _process_queue_item(bot, item_id)
     except Exception as e:
         logger.error(f"Queue processor error for item {item_id}: {e}", exc_info=True)
-        session = get_session()
-        result = await session.execute(select(QueueItem).filter_by(id=item_id))
-        db_item = result.scalars().first()
-        if db_item:
-            msg_id = db_item.status_msg_id
-            chat_id = db_item.chat_id
-            db_item.status = "error"
-            await session.commit()
-            if msg_id:
-                try: await bot.edit_message_text(chat_id=chat_id, message_id=msg_id, text="❌")
-                except Exception: pass
-        await session.close()
+        async with session_scope() as session:
+            result = await session.execute(select(QueueItem).filter_by(id=item_id))
+            db_item = result.scalars().first()
+            if db_item:
+                msg_id = db_item.status_msg_id
+                chat_id = db_item.chat_id
+                db_item.status = "error"
+                await session.commit()
+                if msg_id:
+                    try: await bot.edit_message_text(chat_id=chat_id, message_id=msg_id, text="❌")
+                    except Exception: pass
 
 
 # ---------------------------------------------------------------------------
-# Audio handler
+# Shared audio/video request validation
 # ---------------------------------------------------------------------------
 
-async def play_audio_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
-    query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
-    try:
-        d = query.data.split("_")
-        sura, start_aya = int(d[1]), int(d[2])
-        end_aya = int(d[3]) if len(d) > 3 else start_aya
-    except: return
+@dataclass(frozen=True, slots=True)
+class _MediaRequest:
+    lang:         str
+    reciter_code: str
+    reciter:      str
+    title:        str
 
-    user         = await get_db_user(update.effective_user)
-    lang         = user.language
-    reciter_code = user.voice or DEFAULT_VOICE
-    if is_rate_limited(user.telegram_id):
-        await query.message.reply_text(t("rate_limited", lang)); return
+@lru_cache(maxsize=None)
+def _reciter_name(reciter_code: str, lang: str) -> str:
+    info = VOICES.get(reciter_code, {"en": "Reciter", "ar": "قارئ"})
+    return info.get(lang, info.get("en", "Reciter"))
 
-    voice_info = VOICES.get(reciter_code, {"en": "Reciter", "ar": "قارئ"})
-    reciter    = voice_info.get(lang, voice_info.get("en", "Reciter"))
-    count      = get_sura_aya_count(quran_data, sura)
+async def _media_request(query, user, sura: int, start_aya: int, end_aya: int) -> _MediaRequest | None:
+    """Rate-limit and range checks shared by audio and video; replies and returns None on failure."""
+    lang = user.language
+    if is_rate_limited(user.telegram_id):
+        await query.message.reply_text(t("rate_limited", lang)); return None
 
+    count = get_sura_aya_count(quran_data, sura)
     if start_aya < 1 or end_aya > count:
-        await query.message.reply_text(t("aya_out_of_range", lang, min=1, max=count)); return
+        await query.message.reply_text(t("aya_out_of_range", lang, min=1, max=count)); return None
     if start_aya > end_aya:
-        await query.message.reply_text(t("invalid_range", lang)); return
+        await query.message.reply_text(t("invalid_range", lang)); return None
     n_ayas  = end_aya - start_aya + 1
     is_full = (start_aya == 1 and end_aya == count)
     if not is_full and n_ayas > MAX_AYAS_PER_REQUEST:
-        await query.message.reply_text(t("too_many_ayas", lang, max=MAX_AYAS_PER_REQUEST, count=n_ayas)); return
+        await query.message.reply_text(t("too_many_ayas", lang, max=MAX_AYAS_PER_REQUEST, count=n_ayas)); return None
+
+    reciter_code = user.voice or DEFAULT_VOICE
+    return _MediaRequest(
+        lang         = lang,
+        reciter_code = reciter_code,
+        reciter      = _reciter_name(reciter_code, lang),
+        title        = _sura_title(sura, lang, start_aya, end_aya),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Audio handler
+# ---------------------------------------------------------------------------
+
+async def play_audio_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
+    query = update.callback_query
+    try: await query.answer()
+    except Exception: pass
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start_aya, end_aya, _ = rng
+
+    user = await get_db_user(update.effective_user)
+    req  = await _media_request(query, user, sura, start_aya, end_aya)
+    if not req: return
+    lang, reciter_code, reciter, title = req.lang, req.reciter_code, req.reciter, req.title
 
-    title   = _sura_title(sura, lang, start_aya, end_aya)
     fid_key = aud_fid_key(reciter_code, sura, start_aya, end_aya)
     cached  = get_file_id(fid_key)
     if cached:
@@ -847,32 +928,15 @@ async def video_generate_handler(update: Update, context: ContextTypes.DEFAULT_T
     query = update.callback_query
     try: await query.answer()
     except Exception: pass
-    try:
-        d = query.data.split("_")
-        sura, start_aya = int(d[1]), int(d[2])
-        end_aya = int(d[3]) if len(d) > 3 else start_aya
-    except: return
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start_aya, end_aya, _ = rng
 
-    user         = await get_db_user(update.effective_user)
-    lang         = user.language
-    reciter_code = user.voice or DEFAULT_VOICE
-    if is_rate_limited(user.telegram_id):
-        await query.message.reply_text(t("rate_limited", lang)); return
-
-    voice_info = VOICES.get(reciter_code, {"en": "Reciter", "ar": "قارئ"})
-    reciter    = voice_info.get(lang, voice_info.get("en", "Reciter"))
-    count      = get_sura_aya_count(quran_data, sura)
-
-    if start_aya < 1 or end_aya > count:
-        await query.message.reply_text(t("aya_out_of_range", lang, min=1, max=count)); return
-    if start_aya > end_aya:
-        await query.message.reply_text(t("invalid_range", lang)); return
-    n_ayas  = end_aya - start_aya + 1
-    is_full = (start_aya == 1 and end_aya == count)
-    if not is_full and n_ayas > MAX_AYAS_PER_REQUEST:
-        await query.message.reply_text(t("too_many_ayas", lang, max=MAX_AYAS_PER_REQUEST, count=n_ayas)); return
+    user = await get_db_user(update.effective_user)
+    req  = await _media_request(query, user, sura, start_aya, end_aya)
+    if not req: return
+    lang, reciter_code, reciter, title = req.lang, req.reciter_code, req.reciter, req.title
 
-    title    = _sura_title(sura, lang, start_aya, end_aya)
     ratio    = user.get_preference("video_ratio", VIDEO_DEFAULT_RATIO)
     vid_bg   = user.get_preference("video_bg",    VIDEO_DEFAULT_BG)
     vid_font = user.get_preference("video_font",  VIDEO_DEFAULT_FONT)
@@ -901,11 +965,9 @@ async def image_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     try: await query.answer()
     except Exception: pass
-    try:
-        d = query.data.split("_")
-        sura, start_aya = int(d[1]), int(d[2])
-        end_aya = int(d[3]) if len(d) > 3 else start_aya
-    except: return
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start_aya, end_aya, _ = rng
 
     user       = await get_db_user(update.effective_user)
     lang       = user.language
@@ -916,8 +978,7 @@ async def image_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     cached     = get_file_id(fid_key)
     title      = _sura_title(sura, lang, start_aya, end_aya)
 
-    idx       = get_sura_start_index(quran_data, sura)
-    raw_pairs = [(i, verses[idx + i - 1]) for i in range(start_aya, end_aya + 1)]
+    raw_pairs = list(enumerate(get_sura_verses(quran_data, verses, sura, start_aya, end_aya), start_aya))
 
     if cached:
         await send_img_page(query, sura, start_aya, end_aya, raw_pairs,
@@ -979,44 +1040,46 @@ async def text_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     try: await query.answer()
     except Exception: pass
-    try:
-        d = query.data.split("_")
-        sura, start = int(d[1]), int(d[2])
-        end         = int(d[3]) if len(d) > 3 else start
-        char_offset = int(d[4]) if len(d) > 4 else 0
-    except: return
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start, end, rest = rng
+    char_offset = rest[0] if rest else 0
 
     user  = await get_db_user(update.effective_user)
     lang  = user.language
     fmt   = user.get_preference("text_format", "msg")
-    durs  = None
+    durs  = fid_key = None
     if fmt in ("srt", "lrc"):
-        voice = user.voice or DEFAULT_VOICE
-        durs  = await asyncio.to_thread(
-            get_verse_durations, AUDIO_DIR, voice, sura, start, end,
-        )
+        voice   = user.voice or DEFAULT_VOICE
+        fid_key = doc_fid_key(fmt, voice, sura, start, end, lang)
+        if not get_file_id(fid_key):
+            # Short interactive probes stay off the render pool so they never wait behind a video.
+            durs = await asyncio.to_thread(get_verse_durations, AUDIO_DIR, voice, sura, start, end)
+            # Missing audio yields zero-length cues; don't pin those timings in the cache.
+            if not all(durs): fid_key = None
 
     if start == end:
-        await send_text_single(query, sura, start, user, lang, verses, quran_data, durations=durs)
+        await send_text_single(query, sura, start, user, lang, verses, quran_data, durations=durs, fid_key=fid_key)
     else:
-        await send_text_range(query, sura, start, end, char_offset, user, lang, verses, quran_data, durations=durs)
+        await send_text_range(query, sura, start, end, char_offset, user, lang, verses, quran_data,
+                              durations=durs, fid_key=fid_key)
 
 
 # ---------------------------------------------------------------------------
 # Tafsir handler
 # ---------------------------------------------------------------------------
 
+_TAFSIR_BATCH = 4
+
 async def tafsir_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
     try: await query.answer()
     except Exception: pass
-    try:
-        p    = query.data.split("_")
-        sura, start = int(p[1]), int(p[2])
-        end      = int(p[3]) if len(p) > 3 else start
-        from_aya = int(p[4]) if len(p) > 4 else start
-        prev_aya = int(p[5]) if len(p) > 5 else start
-    except: return
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start, end, rest = rng
+    from_aya = rest[0] if len(rest) > 0 else start
+    prev_aya = rest[1] if len(rest) > 1 else start
 
     user      = await get_db_user(update.effective_user)
     lang      = user.language
@@ -1032,25 +1095,29 @@ async def tafsir_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
     else:
         header   = f"📖 {sura_name} ({start}-{end}) — {t('tafsir', lang)}\n"
         blocks, char_acc, next_aya = [], len(header), None
-        for aya in range(from_aya, end + 1):
-            text  = await get_tafsir(sura, aya, source) or not_found
-            block = f"﴿{aya}﴾ {text}"
-            sep   = "\n\n" if blocks else ""
-            if blocks and char_acc + len(sep) + len(block) > CHAR_LIMIT:
-                next_aya = aya; break
-            blocks.append(block); char_acc += len(sep) + len(block)
+        # A page rarely holds more than a few ayas, so fetch in small concurrent batches.
+        for batch_start in range(from_aya, end + 1, _TAFSIR_BATCH):
+            batch_end = min(end, batch_start + _TAFSIR_BATCH - 1)
+            texts     = await get_tafsir_range(sura, batch_start, batch_end, source)
+            for aya, text in enumerate(texts, batch_start):
+                block = f"﴿{aya}﴾ {text or not_found}"
+                sep   = "\n\n" if blocks else ""
+                if blocks and char_acc + len(sep) + len(block) > CHAR_LIMIT:
+                    next_aya = aya; break
+                blocks.append(block); char_acc += len(sep) + len(block)
+            if next_aya is not None: break
         page_text = header + "\n\n".join(blocks)
 
     nav = []
     if from_aya > start:
-        nav.append(InlineKeyboardButton("⬅️", callback_data=f"tafpage_{sura}_{start}_{end}_{prev_aya}_{start}"))
+        nav.append(nav_button(PREV_ARROW, f"tafpage_{sura}_{start}_{end}_{prev_aya}_{start}"))
     if next_aya is not None:
-        nav.append(InlineKeyboardButton("➡️", callback_data=f"tafpage_{sura}_{start}_{end}_{next_aya}_{from_aya}"))
+        nav.append(nav_button(NEXT_ARROW, f"tafpage_{sura}_{start}_{end}_{next_aya}_{from_aya}"))
     keyboard = InlineKeyboardMarkup(
         ([nav] if nav else []) +
-        [[InlineKeyboardButton(t("back", lang), callback_data=f"verse_back_{sura}_{start}_{end}")]]
+        [[nav_button(t("back", lang), f"verse_back_{sura}_{start}_{end}")]]
     )
-    await query.edit_message_text(page_text, reply_markup=keyboard)
+    debounced_edit(query, page_text, reply_markup=keyboard)
 
 
 # ---------------------------------------------------------------------------
@@ -1059,19 +1126,15 @@ async def tafsir_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
 
 async def back_to_verse_handler(update: Update, _context: ContextTypes.DEFAULT_TYPE):
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
-    try:
-        p    = query.data.split("_")
-        sura, start = int(p[2]), int(p[3])
-        end  = int(p[4]) if len(p) > 4 else start
-    except: return
+    _ack(query)
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start, end, _ = rng
 
     user  = await get_db_user(update.effective_user)
     lang  = user.language
     title = f"📖 {_sura_title(sura, lang, start, end)}"
-    clen  = _verse_char_len(sura, start, end)
-    kb    = build_verse_keyboard(sura, start, end, lang, quran_data, verse_char_len=clen)
+    kb    = build_verse_keyboard(sura, start, end, lang, quran_data)
 
     if query.message and query.message.photo:
         try: await query.message.delete()
@@ -1094,18 +1157,14 @@ async def back_to_verse_handler(update: Update, _context: ContextTypes.DEFAULT_T
 async def more_handler(update: Update, _context: ContextTypes.DEFAULT_TYPE):
     """Handle more_{sura}_{start}_{end} — expand keyboard in-place."""
     query = update.callback_query
-    try: await query.answer()
-    except Exception: pass
-    try:
-        p    = query.data.split("_")
-        sura, start = int(p[1]), int(p[2])
-        end  = int(p[3]) if len(p) > 3 else start
-    except: return
+    _ack(query)
+    rng = _cb_range(query.data)
+    if not rng: return
+    sura, start, end, _ = rng
 
     user = await get_db_user(update.effective_user)
     lang = user.language
-    idx         = get_sura_start_index(quran_data, sura)
-    verse_chars = sum(len(verses[idx + i - 1]) for i in range(start, end + 1))
+    verse_chars = _verse_char_len(sura, start, end)
     kb          = build_more_keyboard(sura, start, end, lang, quran_data, verse_chars=verse_chars)
 
     try:
@@ -1205,7 +1264,7 @@ async def page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE, page_
 # Search
 # ---------------------------------------------------------------------------
 
-async def _send_search_results(message, results: list, query_text: str, lang: str, page_offset: int, edit: bool = False):
+async def _send_search_results(message, results: list[SearchHit], query_text: str, lang: str, page_offset: int, edit: bool = False):
     RES_PER_PAGE = 8
     text_parts   = [t("search_results_hdr", lang, query=query_text)]
     buttons      = []
@@ -1214,12 +1273,12 @@ async def _send_search_results(message, results: list, query_text: str, lang: st
 
     while i < limit:
         r     = results[i]
-        sname = get_sura_display_name(quran_data, r["sura"], lang)
-        snippet = make_snippet(r["text"], query_text)
-        snippet = replace_basmala_symbol(snippet, r["sura"], r["aya"])
-        line  = f"\n﴿{snippet}﴾\n— {sname} ({r['aya']})"
+        sname = get_sura_display_name(quran_data, r.sura, lang)
+        snippet = make_snippet(r.text, query_text)
+        snippet = replace_basmala_symbol(snippet, r.sura, r.aya)
+        line  = f"\n﴿{snippet}﴾\n— {sname} ({r.aya})"
         text_parts.append(line)
-        buttons.append({"sura": r["sura"], "aya": r["aya"], "sname": sname})
+        buttons.append({"sura": r.sura, "aya": r.aya, "sname": sname})
         i += 1
 
     rows, row = [], []
@@ -1230,9 +1289,9 @@ async def _send_search_results(message, results: list, query_text: str, lang: st
 
     nav = []
     if page_offset > 0:
-        nav.append(InlineKeyboardButton("⬅️", callback_data=f"search_page_{max(0, page_offset - RES_PER_PAGE)}_{query_text[:40]}"))
+        nav.append(nav_button(PREV_ARROW, f"search_page_{max(0, page_offset - RES_PER_PAGE)}_{query_text[:40]}"))
     if i < len(results):
-        nav.append(InlineKeyboardButton("➡️", callback_data=f"search_page_{i}_{query_text[:40]}"))
+        nav.append(nav_button(NEXT_ARROW, f"search_page_{i}_{query_text[:40]}"))
     if nav: rows.append(nav)
 
     # Add page indicator
@@ -1267,8 +1326,7 @@ async def search_result_handler(update: Update, context: ContextTypes.DEFAULT_TY
         response = f"{title}\n\n﷽\n﴿ {inner} ({aya}) ﴾"
     else:
         response = f"{title}\n\n﴿ {disp} ({aya}) ﴾"
-    clen = len(text)
-    kb   = build_verse_keyboard(sura, aya, aya, lang, quran_data, verse_char_len=clen)
+    kb   = build_verse_keyboard(sura, aya, aya, lang, quran_data)
     if len(response) <= CHAR_LIMIT:
         await query.edit_message_text(response, reply_markup=kb)
     else:
@@ -1293,41 +1351,51 @@ async def search_page_handler(update: Update, context: ContextTypes.DEFAULT_TYPE
 # NLU message router
 # ---------------------------------------------------------------------------
 
+async def _intent_aya(update, context, intent, lang):
+    sura, aya = intent["sura"], intent["aya"]
+    await update.message.reply_text(
+        f"📖 {_sura_title(sura, lang, aya)}",
+        reply_markup=build_verse_keyboard(sura, aya, aya, lang, quran_data),
+    )
+
+async def _intent_range(update, context, intent, lang):
+    sura, start, end = intent["sura"], intent["from_aya"], intent["to_aya"]
+    await update.message.reply_text(
+        f"📖 {_sura_title(sura, lang, start, end)}",
+        reply_markup=build_verse_keyboard(sura, start, end, lang, quran_data),
+    )
+
+async def _intent_surah(update, context, intent, lang):
+    sura  = intent["sura"]
+    count = get_sura_aya_count(quran_data, sura)
+    await update.message.reply_text(
+        f"📖 {get_sura_display_name(quran_data, sura, lang)}",
+        reply_markup=build_verse_keyboard(sura, 1, count, lang, quran_data),
+    )
+
+async def _intent_page(update, context, intent, lang):
+    await page_handler(update, context, intent["page"])
+
+async def _intent_search(update, context, intent, lang):
+    results = search(quran_data, simple_verses, update.message.text)
+    if not results:
+        await update.message.reply_text(t("no_results", lang)); return
+    await _send_search_results(update.message, results, update.message.text, lang, 0)
+
+_INTENTS: dict = {
+    "aya":    _intent_aya,
+    "range":  _intent_range,
+    "surah":  _intent_surah,
+    "page":   _intent_page,
+    "search": _intent_search,
+}
+
 async def message_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
     if not update.message or not update.message.text: return
-    user   = await get_db_user(update.effective_user)
-    lang   = user.language
-    intent = parse_message(update.message.text, quran_data)
-
-    if intent["type"] == "aya":
-        sura, aya = intent["sura"], intent["aya"]
-        clen = _verse_char_len(sura, aya, aya)
-        await update.message.reply_text(
-            f"📖 {_sura_title(sura, lang, aya)}",
-            reply_markup=build_verse_keyboard(sura, aya, aya, lang, quran_data, verse_char_len=clen),
-        )
-    elif intent["type"] == "range":
-        sura, start, end = intent["sura"], intent["from_aya"], intent["to_aya"]
-        clen = _verse_char_len(sura, start, end)
-        await update.message.reply_text(
-            f"📖 {_sura_title(sura, lang, start, end)}",
-            reply_markup=build_verse_keyboard(sura, start, end, lang, quran_data, verse_char_len=clen),
-        )
-    elif intent["type"] == "surah":
-        sura  = intent["sura"]
-        count = get_sura_aya_count(quran_data, sura)
-        clen  = _verse_char_len(sura, 1, count)
-        await update.message.reply_text(
-            f"📖 {get_sura_display_name(quran_data, sura, lang)}",
-            reply_markup=build_verse_keyboard(sura, 1, count, lang, quran_data, verse_char_len=clen),
-        )
-    elif intent["type"] == "page":
-        await page_handler(update, context, intent["page"])
-    elif intent["type"] == "search":
-        results = search(quran_data, simple_verses, update.message.text)
-        if not results:
-            await update.message.reply_text(t("no_results", lang)); return
-        await _send_search_results(update.message, results, update.message.text, lang, 0)
+    user    = await get_db_user(update.effective_user)
+    intent  = parse_message(update.message.text, quran_data)
+    handler = _INTENTS.get(intent["type"])
+    if handler: await handler(update, context, intent, user.language)
 
 
 # ---------------------------------------------------------------------------
@@ -1361,23 +1429,25 @@ async def admin_handler(update: Update, context: ContextTypes.DEFAULT_TYPE):
         await update.message.reply_text(t("admin_not_allowed", lang)); return
     import time as _time
 
+    from sqlalchemy import func as _func
+
     from config import RATE_MAX_REQUESTS, RATE_WINDOW_SECONDS
     from core.utils import _rate_store
-    session        = get_session()
-    from sqlalchemy import func as _func
-    pending_q      = (await session.execute(select(_func.count(QueueItem.id)).filter_by(status="pending"))).scalar() or 0
-    processing_q   = (await session.execute(select(_func.count(QueueItem.id)).filter_by(status="processing"))).scalar() or 0
-    done_q         = (await session.execute(select(_func.count(QueueItem.id)).filter_by(status="done"))).scalar() or 0
+    async with session_scope() as session:
+        counts = dict((await session.execute(
+            select(QueueItem.status, _func.count(QueueItem.id)).group_by(QueueItem.status)
+        )).all())
+        bstats = await get_stats(session)
+    pending_q    = counts.get("pending", 0)
+    processing_q = counts.get("processing", 0)
+    done_q       = counts.get("done", 0)
 
-    await session.close()
     now_t         = _time.monotonic()
     limited_count = sum(1 for ts in _rate_store.values()
                         if len([x for x in ts if now_t - x < RATE_WINDOW_SECONDS]) >= RATE_MAX_REQUESTS)
     free_mb      = get_free_mb(OUTPUT_DIR)
     cache_size   = file_id_count()
     cached_files = sum(1 for _ in OUTPUT_DIR.rglob("*") if _.is_file() and _.suffix in (".mp3", ".mp4"))
-    ss = get_session()
-    bstats = await get_stats(ss); await ss.close()
     lines = [
         t("admin_title", lang), "",
         t("admin_queue",  lang, pending=pending_q),
@@ -1490,10 +1560,20 @@ async def _daily_hadith_job(context) -> None:
         log_error(e, context="daily_hadith_job")
 
 
+async def _tafsir_purge_job(context) -> None:
+    try:
+        n = await purge_expired_tafsir()
+        if n: logger.info("Purged %d expired tafsir cache rows", n)
+    except Exception as e:
+        logger.warning("Tafsir cache purge failed: %s", e)
+
+
 async def _post_init(app):
     await init_db()
     request_queue.set_processor(_safe_process_queue_item)
     await request_queue.start(app.bot)
+    if app.job_queue:
+        app.job_queue.run_daily(_tafsir_purge_job, time=datetime.time(hour=3, minute=30, tzinfo=datetime.timezone.utc))
     if CHANNEL_ID and DAILY_HADITH_COUNT > 0 and app.job_queue:
         for hour in DAILY_HADITH_HOURS[:DAILY_HADITH_COUNT]:
             app.job_queue.run_daily(
@@ -1503,6 +1583,40 @@ async def _post_init(app):
         logger.info("Daily hadith: %d job(s) at UTC hours %s", DAILY_HADITH_COUNT, DAILY_HADITH_HOURS)
 
 
+# Only the update kinds registered in main(); Telegram drops the rest server-side.
+_ALLOWED_UPDATES = [Update.MESSAGE, Update.CALLBACK_QUERY, Update.PRE_CHECKOUT_QUERY]
+
+class _PerUserUpdateProcessor(BaseUpdateProcessor):
+    """Runs updates concurrently across users but strictly in order per user,
+    so two quick taps from one user can never interleave their handlers.
+
+    Handlers must not wait on Telegram throttling while holding the user's turn:
+    menu edits go through utils.debounced_edit, whose debounce and RetryAfter
+    waits run in a per-message task outside this lock.
+    """
+
+    def __init__(self, max_concurrent_updates: int):
+        super().__init__(max_concurrent_updates)
+        self._locks: dict[int, list] = {}   # user_id → [Lock, updates holding/awaiting it]
+
+    async def do_process_update(self, update, coroutine) -> None:
+        user = getattr(update, "effective_user", None)
+        if user is None:
+            await coroutine; return
+        entry = self._locks.setdefault(user.id, [asyncio.Lock(), 0])
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                await coroutine
+        finally:
+            entry[1] -= 1
+            if not entry[1]: del self._locks[user.id]
+
+    async def initialize(self) -> None: pass
+
+    async def shutdown(self) -> None: pass
+
+
 def main():
     global quran_data, verses, simple_verses
     from bot_router import callback_router
@@ -1514,6 +1628,8 @@ def main():
     print(f"Loaded Simple text ({len(simple_verses)} verses).")
     if not BOT_TOKEN: print("ERROR: BOT_TOKEN not set."); return
 
+    # One shared keep-alive pool for all outgoing API calls; long-polling gets
+    # its own single connection so it never waits behind uploads for a slot.
     request = HTTPXRequest(
         connection_pool_size=HTTP_POOL_SIZE,
         connect_timeout=HTTP_CONNECT_TIMEOUT,
@@ -1521,10 +1637,17 @@ def main():
         write_timeout=HTTP_WRITE_TIMEOUT,
         pool_timeout=HTTP_POOL_TIMEOUT,
     )
+    updates_request = HTTPXRequest(
+        connection_pool_size=1,
+        connect_timeout=HTTP_CONNECT_TIMEOUT,
+        read_timeout=HTTP_READ_TIMEOUT,
+    )
     app = (
         Application.builder()
         .token(BOT_TOKEN)
         .request(request)
+        .get_updates_request(updates_request)
+        .concurrent_updates(_PerUserUpdateProcessor(CONCURRENT_UPDATES))
         .post_init(_post_init)
         .build()
     )
@@ -1541,4 +1664,13 @@ def main():
     app.add_handler(PreCheckoutQueryHandler(pre_checkout_handler))
     app.add_handler(MessageHandler(filters.SUCCESSFUL_PAYMENT, successful_payment_handler))
     print("Bot started! Press Ctrl+C to stop")
-    app.run_polling(allowed_updates=Update.ALL_TYPES)
+    if WEBHOOK_URL:
+        # Telegram pushes updates to us. The path is not a credential (it ends up in proxy
+        # logs); requests are authenticated by the secret_token header instead.
+        app.run_webhook(
+            listen=WEBHOOK_LISTEN, port=WEBHOOK_PORT, url_path=WEBHOOK_PATH,
+            webhook_url=f"{WEBHOOK_URL}/{WEBHOOK_PATH}", secret_token=WEBHOOK_SECRET,
+            allowed_updates=_ALLOWED_UPDATES,
+        )
+    else:
+        app.run_polling(allowed_updates=_ALLOWED_UPDATES)
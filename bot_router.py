@@ -1,4 +1,5 @@
 import logging
+import re
 
 from telegram import Update
 from telegram.ext import ContextTypes
@@ -69,10 +70,15 @@ _PREFIX: list[tuple] = [
     ("search_page_",  search_page_handler),
 ]
 
+# One alternation, tried in _PREFIX order (so "voice_list_" still wins over "voice_");
+# the matching group number picks the handler.
+_PREFIX_RE       = re.compile("|".join(f"({re.escape(prefix)})" for prefix, _ in _PREFIX))
+_PREFIX_HANDLERS = [h for _, h in _PREFIX]
+
 async def callback_router(update: Update, context: ContextTypes.DEFAULT_TYPE):
     data    = update.callback_query.data
     handler = _EXACT.get(data)
     if handler: await handler(update, context); return
-    for prefix, h in _PREFIX:
-        if data.startswith(prefix): await h(update, context); return
+    m = _PREFIX_RE.match(data)
+    if m: await _PREFIX_HANDLERS[m.lastindex - 1](update, context); return
     logger.warning("Unrouted callback: %s", data)
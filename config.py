@@ -12,6 +12,7 @@ from ``settings`` so every existing ``from config import X`` site keeps working
 unchanged.
 """
 import os
+import secrets
 from dataclasses import dataclass, field
 from pathlib import Path
 
@@ -41,6 +42,14 @@ class Settings:
     donate_url: str = field(default_factory=lambda: os.getenv("DONATE_URL", ""))
     username:   str = field(default_factory=lambda: os.getenv("PAGE_USERNAME", ""))
 
+    # ── Webhook (optional; long polling when webhook_url is empty) ───
+    webhook_url:    str = field(default_factory=lambda: os.getenv("WEBHOOK_URL", "").rstrip("/"))
+    webhook_listen: str = field(default_factory=lambda: os.getenv("WEBHOOK_LISTEN", "0.0.0.0"))
+    webhook_port:   int = field(default_factory=lambda: int(os.getenv("WEBHOOK_PORT", "8443")))
+    webhook_path:   str = field(default_factory=lambda: os.getenv("WEBHOOK_PATH", "telegram").strip("/"))
+    # Telegram echoes this in X-Telegram-Bot-Api-Secret-Token; random per start when unset.
+    webhook_secret: str = field(default_factory=lambda: os.getenv("WEBHOOK_SECRET", "") or secrets.token_urlsafe(32))
+
     # ── API endpoints ────────────────────────────────────────────────
     audio_api: str = "https://everyayah.com/data"
     quran_api: str = "https://api.alquran.cloud/v1"
@@ -53,15 +62,34 @@ class Settings:
     http_connect_timeout: int = 30
     http_read_timeout:    int = 180
     http_write_timeout:   int = 180
-    http_pool_size:       int = 8
+    http_pool_size:       int = field(
+        default_factory=lambda: int(os.getenv("HTTP_POOL_SIZE", "32"))
+    )
     http_pool_timeout:    int = 60
     download_timeout:     int = 60
+    download_workers:     int = 8
 
     # ── Limits ───────────────────────────────────────────────────────
     char_limit:           int = 800
     max_ayas_per_request: int = 40
     image_chars_limit:    int = 1200
 
+    # ── CPU-bound media work (ffmpeg / PIL) ──────────────────────────
+    media_workers: int = field(
+        default_factory=lambda: int(os.getenv("MEDIA_WORKERS", "0")) or max(2, (os.cpu_count() or 2) // 2)
+    )
+    queue_workers: int = field(
+        default_factory=lambda: max(1, int(os.getenv("QUEUE_WORKERS", "1")))
+    )
+
+    # ── Telegram update handling ─────────────────────────────────────
+    # Updates handled at once across users (each user's own updates still run in
+    # order); 1 restores PTB's strictly sequential default.
+    concurrent_updates: int = field(
+        default_factory=lambda: max(1, int(os.getenv("CONCURRENT_UPDATES", "64")))
+    )
+    edit_debounce_seconds: float = 0.25
+
     # ── Rate limiting ────────────────────────────────────────────────
     rate_window_seconds: int = 3600
     rate_max_requests:   int = 10
@@ -90,6 +118,12 @@ CHANNEL_ID  = settings.channel_id
 DONATE_URL  = settings.donate_url
 USERNAME    = settings.username
 
+WEBHOOK_URL    = settings.webhook_url
+WEBHOOK_LISTEN = settings.webhook_listen
+WEBHOOK_PORT   = settings.webhook_port
+WEBHOOK_PATH   = settings.webhook_path
+WEBHOOK_SECRET = settings.webhook_secret
+
 AUDIO_API = settings.audio_api
 QURAN_API = settings.quran_api
 
@@ -102,11 +136,18 @@ HTTP_WRITE_TIMEOUT   = settings.http_write_timeout
 HTTP_POOL_SIZE       = settings.http_pool_size
 HTTP_POOL_TIMEOUT    = settings.http_pool_timeout
 DOWNLOAD_TIMEOUT     = settings.download_timeout
+DOWNLOAD_WORKERS     = settings.download_workers
 
 CHAR_LIMIT           = settings.char_limit
 MAX_AYAS_PER_REQUEST = settings.max_ayas_per_request
 IMAGE_CHARS_LIMIT    = settings.image_chars_limit
 
+MEDIA_WORKERS        = settings.media_workers
+QUEUE_WORKERS        = settings.queue_workers
+
+CONCURRENT_UPDATES    = settings.concurrent_updates
+EDIT_DEBOUNCE_SECONDS = settings.edit_debounce_seconds
+
 RATE_WINDOW_SECONDS  = settings.rate_window_seconds
 RATE_MAX_REQUESTS    = settings.rate_max_requests
 
@@ -150,6 +191,7 @@ VOICES: dict[str, dict] = {
     "Sahl_Yassin_128kbps":            {"ar": "سهل ياسين",            "en": "Sahl Yassin"},
     "Warsh_Ibrahim_Walk_192kbps":     {"ar": "إبراهيم الأخضر (ورش)", "en": "Ibrahim Walk (Warsh)"},
 }
+VOICE_KEYS: tuple[str, ...] = tuple(VOICES)   # stable menu/selection order
 
 # ── Tafsir sources ────────────────────────────────────────────────────────────
 DEFAULT_TAFSIR = "muyassar"
@@ -300,3 +342,6 @@ def vid_fid_key(reciter: str, sura: int, start: int, end: int,
 
 def aud_fid_key(reciter: str, sura: int, start: int, end: int) -> str:
     return f"audio:{reciter}:{sura}:{start}:{end}"
+
+def doc_fid_key(fmt: str, reciter: str, sura: int, start: int, end: int, lang: str) -> str:
+    return f"{fmt}:{reciter}:{sura}:{start}:{end}:{lang}"
@@ -12,13 +12,15 @@ strip pass is a cheap copy-only operation that guarantees a clean output
 regardless of what the source files or FFmpeg version left behind.
 """
 import logging
+import os
 import subprocess
 import tempfile
 from pathlib import Path
 
 from config import FFMPEG_BIN
 
-from .downloader import download_audio
+from .data import get_sura_aya_count
+from .downloader import download_many, scan_sura_dir
 
 logger = logging.getLogger(__name__)
 
@@ -45,40 +47,50 @@ def gen_mp3(
     voice_output_dir.mkdir(parents=True, exist_ok=True)
     output_path      = voice_output_dir / filename
 
-    if output_path.exists():
+    # Deterministic name per (voice, range) → finished files double as a disk cache.
+    if output_path.exists() and output_path.stat().st_size > 0:
+        output_path.touch()   # bump mtime: storage purge evicts least-recently-used first
         if progress_cb: progress_cb(100)
         return output_path
 
     # ── Collect verse list ────────────────────────────────────────────────
     files = []
     for sura in range(start_sura, end_sura + 1):
-        max_aya   = int(quran_data["Sura"][sura][1])
+        max_aya   = get_sura_aya_count(quran_data, sura)
         aya_start = start_aya if sura == start_sura else 1
         aya_end   = end_aya   if sura == end_sura   else max_aya
         for aya in range(aya_start, aya_end + 1):
             files.append((sura, aya))
 
-    # ── Phase 0: download missing files ──────────────────────────────────
-    total      = len(files)
-    downloaded = []
-    for idx, (sura, aya) in enumerate(files):
-        path = audio_dir / voice / str(sura) / f"{sura:03d}{aya:03d}.mp3"
-
-        if path.exists() and path.stat().st_size == 0:
+    # ── Phase 0: download missing files (concurrently) ───────────────────
+    present = {sura: scan_sura_dir(audio_dir, voice, sura) for sura in range(start_sura, end_sura + 1)}
+    paths   = [audio_dir / voice / str(sura) / f"{sura:03d}{aya:03d}.mp3" for sura, aya in files]
+    missing = []
+    for (sura, aya), path in zip(files, paths):
+        entry = present[sura].get(path.name)
+        if entry is not None and entry.stat().st_size == 0:
             logger.warning("Empty audio file, re-downloading: %s", path)
             path.unlink()
+            entry = None
+        if entry is None:
+            missing.append((sura, aya))
 
-        if not path.exists():
-            path = download_audio(voice, sura, aya)
-
-        if not path or not path.exists() or path.stat().st_size == 0:
-            if path and path.exists():
-                path.unlink()
-            raise FileNotFoundError(f"Failed to download valid audio: {sura}:{aya}")
+    fetched = {}
+    if missing:
+        dl_cb   = (lambda done: progress_cb(int(done / len(missing) * 65))) if progress_cb else None   # 0–65%
+        fetched = download_many(voice, missing, progress_cb=dl_cb)
 
+    # Files found by the scan are known-good; only fresh downloads need checking.
+    downloaded = []
+    for ref, path in zip(files, paths):
+        if ref in fetched:
+            path = fetched[ref]
+            if not path or not path.exists() or path.stat().st_size == 0:
+                if path and path.exists():
+                    path.unlink()
+                raise FileNotFoundError(f"Failed to download valid audio: {ref[0]}:{ref[1]}")
         downloaded.append(path)
-        if progress_cb:
-            progress_cb(int((idx + 1) / total * 65))   # 0–65%
+    if progress_cb: progress_cb(65)
 
     # ── Phase 1: concat ───────────────────────────────────────────────────
     # Write a concat list file for FFmpeg's concat demuxer (safest for MP3).
@@ -105,12 +117,23 @@ def gen_mp3(
         # ── Phase 2: strip residual tags / album art ──────────────────────
         # A copy-only pass with -map_metadata -1 removes any ID3 frames
         # (including APIC album-art) that survived from source files.
-        _ffmpeg([
-            "-i", str(concat_out),
-            "-map_metadata", "-1",
-            "-codec:a", "copy",
-            str(output_path),
-        ], stage="strip")
+        # Written next to the target and renamed, so an interrupted run never
+        # leaves a truncated file that the cache check above would serve.
+        # The temp name is unique per call, so two workers building the same
+        # range never write into one file.
+        fd, part = tempfile.mkstemp(dir=output_path.parent, prefix=f"{output_path.stem}.", suffix=".part.mp3")
+        os.close(fd)
+        try:
+            _ffmpeg([
+                "-i", str(concat_out),
+                "-map_metadata", "-1",
+                "-codec:a", "copy",
+                part,
+            ], stage="strip")
+            os.replace(part, output_path)
+        except BaseException:
+            Path(part).unlink(missing_ok=True)
+            raise
 
     if progress_cb: progress_cb(100)
     return output_path
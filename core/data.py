@@ -1,4 +1,6 @@
+import json
 import re
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,34 @@ _DIACRITICS = re.compile(r'[\u0610-\u061A\u064B-\u065F\u0670\u0640]')
 # Bare basmala for prefix detection (after normalization)
 _BASMALA_BARE = 'بسم الله الرحمن الرحيم'
 
+# quran-data.json is JS-flavoured: // comments, 'single-quoted' strings, trailing
+# commas. Rewriting just those tokens and parsing with the C json module is
+# hundreds of times faster than json5, which stays as the fallback.
+_JS_TOKENS = re.compile(
+    r'"(?:[^"\\\n]|\\.)*"'      # "double-quoted" — kept as is
+    r"|'((?:[^'\\\n]|\\.)*)'"   # 'single-quoted' — re-quoted
+    r"|//[^\n]*|/\*.*?\*/"      # comments — dropped
+    r"|,(?=\s*[\]}])",          # trailing commas — dropped
+    re.S,
+)
+
+
+def _js_token_to_json(m: re.Match) -> str:
+    tok = m.group(0)
+    if tok[0] == '"':
+        return tok
+    if tok[0] == "'":
+        inner = json5.loads(tok) if "\\" in tok else m.group(1)
+        return json.dumps(inner, ensure_ascii=False)
+    return ""
+
+
+def _loads_js(text: str) -> Any:
+    try:
+        return json.loads(_JS_TOKENS.sub(_js_token_to_json, text))
+    except ValueError:
+        return json5.loads(text)
+
 
 def _normalize_basmala(text: str) -> str:
     """Strip diacritics and normalize alif variants for basmala detection only."""
@@ -65,17 +95,22 @@ def replace_basmala_page(verse_text: str, sura: int, aya: int) -> str:
     return ('﷽\n' + rest).strip() if rest else '﷽'
 
 
+@lru_cache(maxsize=8)
 def load_quran_data(data_dir: Path) -> dict[str, Any]:
     """Load Quran metadata from quran-data.json.
     Source: tanzil.net — https://tanzil.net/docs/quran_metadata
     License: CC BY 3.0
+
+    The three loaders are cached per directory and hand every caller the same
+    object; treat the results as read-only (derived "_" tables aside).
     """
     json_path = data_dir / "quran-data.json"
     if json_path.exists():
-        return json5.loads(json_path.read_text(encoding="utf-8"))
+        return _loads_js(json_path.read_text(encoding="utf-8"))
     raise FileNotFoundError(f"quran-data.json not found in {data_dir}")
 
 
+@lru_cache(maxsize=8)
 def load_quran_text(data_dir: Path) -> list[str]:
     """Load Quran text (Uthmani script) — for video rendering.
     Source: tanzil.net — https://tanzil.net/docs/quran_text  (quran-uthmani.txt)
@@ -88,6 +123,7 @@ def load_quran_text(data_dir: Path) -> list[str]:
     return []
 
 
+@lru_cache(maxsize=8)
 def load_quran_text_simple(data_dir: Path) -> list[str]:
     """Load simplified Quran text — for display, search, tafsir, subtitles.
 
@@ -101,24 +137,67 @@ def load_quran_text_simple(data_dir: Path) -> list[str]:
     raise FileNotFoundError(f"quran-simple.txt not found in {data_dir}")
 
 
+def _sura_names(quran_data: dict[str, Any]) -> dict[str, tuple[str, ...]]:
+    """Bare and prefixed sura names per script, indexed by sura number, built once per dataset."""
+    tables = quran_data.get("_names")
+    if tables is None:
+        ar, latin = [], []
+        for n, e in enumerate(quran_data["Sura"]):
+            ar.append(e[4] if len(e) > 4 else f"سورة {n}")
+            latin.append(e[5] if len(e) > 5 else e[4] if len(e) > 4 else f"Sura {n}")
+        tables = quran_data["_names"] = {
+            "ar":            tuple(ar),
+            "latin":         tuple(latin),
+            "ar_display":    tuple(f"سورة {x}" for x in ar),
+            "latin_display": tuple(f"Surah {x}" for x in latin),
+        }
+    return tables
+
+
 def get_sura_name(quran_data: dict[str, Any], sura_num: int, lang: str = "ar") -> str:
     """Get bare sura name (no prefix)."""
-    entry = quran_data["Sura"][sura_num]
-    if lang == "ar":
-        return entry[4] if len(entry) > 4 else f"سورة {sura_num}"
-    return entry[5] if len(entry) > 5 else entry[4] if len(entry) > 4 else f"Sura {sura_num}"
+    return _sura_names(quran_data)["ar" if lang == "ar" else "latin"][sura_num]
 
 
 def get_sura_display_name(quran_data: dict[str, Any], sura_num: int, lang: str = "ar") -> str:
     """Get sura name always prefixed: 'سورة الإخلاص' / 'Surah Al-Ikhlas'."""
-    bare = get_sura_name(quran_data, sura_num, lang)
-    prefix = "سورة" if lang == "ar" else "Surah"
-    return f"{prefix} {bare}"
+    return _sura_names(quran_data)["ar_display" if lang == "ar" else "latin_display"][sura_num]
+
+
+def _sura_offsets(quran_data: dict[str, Any]) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Flat (starts, counts) tables indexed by sura number, built once per dataset.
+
+    Index 0 is a placeholder so ``starts[sura]`` lines up with the 1-based Tanzil rows.
+    """
+    tables = quran_data.get("_offsets")
+    if tables is None:
+        rows   = quran_data["Sura"]
+        starts = tuple(int(r[0]) if r else 0 for r in rows)
+        counts = tuple(int(r[1]) if r else 0 for r in rows)
+        tables = quran_data["_offsets"] = (starts, counts)
+    return tables
+
+
+def _verse_locations(quran_data: dict[str, Any]) -> tuple[tuple[int, int], ...]:
+    """(sura, aya) for every 0-based verse index, built once per dataset."""
+    table = quran_data.get("_locations")
+    if table is None:
+        starts, counts = _sura_offsets(quran_data)
+        table = quran_data["_locations"] = tuple(
+            (sura, aya) for sura in range(1, len(starts)) for aya in range(1, counts[sura] + 1)
+        )
+    return table
 
 
 def get_sura_aya_count(quran_data: dict[str, Any], sura_num: int) -> int:
-    return int(quran_data["Sura"][sura_num][1])
+    return _sura_offsets(quran_data)[1][sura_num]
 
 
 def get_sura_start_index(quran_data: dict[str, Any], sura_num: int) -> int:
-    return int(quran_data["Sura"][sura_num][0])
+    return _sura_offsets(quran_data)[0][sura_num]
+
+
+def get_sura_verses(quran_data: dict[str, Any], verses: list[str], sura_num: int, start: int, end: int) -> list[str]:
+    """Texts of ayas start..end (inclusive, 1-based) of a sura as one slice of the verses list."""
+    idx = _sura_offsets(quran_data)[0][sura_num]
+    return verses[idx + start - 1:idx + end]
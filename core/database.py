@@ -1,15 +1,20 @@
 """
 database.py — SQLAlchemy models and session management for QBot.
 """
+import time
 from asyncio import current_task
+from contextlib import asynccontextmanager
 from datetime import datetime, timezone
 
-from sqlalchemy import JSON, Column, DateTime, Integer, String, Text, select
+from sqlalchemy import JSON, Column, DateTime, Integer, String, Text, case, event, func, literal, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession, async_scoped_session, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
 from config import DATA_DIR
 
+from .utils import LRUCache
+
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 DB_PATH = DATA_DIR / "qbot.db"
 
@@ -76,13 +81,24 @@ async def get_stats(session) -> "BotStats":
 
 async def increment_stat(field: str, amount: int = 1) -> None:
     """Atomically increment a BotStats counter field."""
-    session = get_session()
-    try:
+    async with session_scope() as session:
         row = await get_stats(session)
         setattr(row, field, (getattr(row, field) or 0) + amount)
         await session.commit()
-    finally:
-        await session.close()
+
+
+async def upsert_tafsir(items: list[tuple[str, str]]) -> None:
+    """Insert or refresh many (cache_key, text) rows with one INSERT … ON CONFLICT statement."""
+    if not items: return
+    now  = datetime.now(timezone.utc)
+    stmt = sqlite_insert(TafsirCache)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[TafsirCache.cache_key],
+        set_={"text": stmt.excluded.text, "created_at": stmt.excluded.created_at},
+    )
+    async with session_scope() as session:
+        await session.execute(stmt, [{"cache_key": k, "text": v, "created_at": now} for k, v in items])
+        await session.commit()
 
 
 engine = create_async_engine(f"sqlite+aiosqlite:///{DB_PATH}", echo=False)
@@ -90,6 +106,16 @@ async_session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_comm
 AsyncScopedSession = async_scoped_session(async_session_factory, scopefunc=current_task)
 
 
+@event.listens_for(engine.sync_engine, "connect")
+def _sqlite_pragmas(dbapi_conn, _record) -> None:
+    # WAL lets readers proceed while a writer commits; with WAL, synchronous=NORMAL
+    # only fsyncs at checkpoints, which is durable enough for prefs/cache rows.
+    cur = dbapi_conn.cursor()
+    for pragma in ("journal_mode=WAL", "synchronous=NORMAL", "temp_store=MEMORY", "mmap_size=268435456"):
+        cur.execute(f"PRAGMA {pragma}")
+    cur.close()
+
+
 async def init_db() -> None:
     # Import queue model here to ensure its table is created
     from core.queue import QueueItem  # noqa: F401
@@ -101,41 +127,87 @@ def get_session() -> AsyncSession:
     return AsyncScopedSession()
 
 
+@asynccontextmanager
+async def session_scope():
+    """`async with session_scope() as s:` — the session is closed even if the body raises."""
+    session = get_session()
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
 # ---------------------------------------------------------------------------
 # User helpers (moved from bot.py)
 # ---------------------------------------------------------------------------
 
+# Every update handler starts with get_db_user, so detached rows are kept for a
+# short TTL and dropped whenever one of the update helpers below writes to them.
+_USER_TTL   = 300.0
+_user_cache = LRUCache(5000)   # telegram_id → (expires_at, User)
+# Bumped on every write; a fetch that overlapped a write must not cache its row.
+_user_gen: dict[int, int] = {}
+
+
+def _invalidate_user(telegram_id: int) -> None:
+    _user_gen[telegram_id] = _user_gen.get(telegram_id, 0) + 1
+    _user_cache.set(telegram_id, (0.0, None))
+
+
 async def get_db_user(telegram_user) -> User:
     """Fetch or create a User record for the given Telegram user."""
-    session = get_session()
-    result = await session.execute(select(User).filter_by(telegram_id=telegram_user.id))
-    user = result.scalars().first()
-    if not user:
-        user = User(telegram_id=telegram_user.id, language="ar")
-        session.add(user)
-        await session.commit()
-    await session.refresh(user)
-    session.expunge(user)
-    await session.close()
+    hit = _user_cache.get(telegram_user.id)
+    if hit and hit[0] > time.monotonic():
+        return hit[1]
+    gen = _user_gen.get(telegram_user.id, 0)
+    async with session_scope() as session:
+        user = (await session.scalars(select(User).where(User.telegram_id == telegram_user.id).limit(1))).first()
+        if not user:
+            user = User(telegram_id=telegram_user.id, language="ar")
+            session.add(user)
+            await session.commit()
+        await session.refresh(user)
+        session.expunge(user)
+    if _user_gen.get(telegram_user.id, 0) == gen:
+        _user_cache.set(telegram_user.id, (time.monotonic() + _USER_TTL, user))
     return user
 
 
 async def update_user_field(telegram_id: int, **fields) -> None:
-    """Update one or more fields on a User record in a single session."""
-    session = get_session()
-    result = await session.execute(select(User).filter_by(telegram_id=telegram_id))
-    user = result.scalars().first()
-    if user:
-        for key, value in fields.items():
-            setattr(user, key, value)
-        await session.commit()
-    await session.close()
+    """Update one or more fields on a User record with a single UPDATE."""
+    try:
+        async with session_scope() as session:
+            await session.execute(update(User).where(User.telegram_id == telegram_id).values(**fields))
+            await session.commit()
+    finally:
+        _invalidate_user(telegram_id)
+
+
 async def update_user_preference(telegram_id: int, key: str, value) -> None:
-    """Safely update a single preference for a user."""
-    session = get_session()
-    result = await session.execute(select(User).filter_by(telegram_id=telegram_id))
-    user = result.scalars().first()
-    if user:
-        user.set_preference(key, value)
-        await session.commit()
-    await session.close()
+    """Set a single preference in place with SQLite json_set (no read-modify-write)."""
+    prefs = func.json_set(func.coalesce(User.preferences, literal("{}", String)), f"$.{key}", value)
+    try:
+        async with session_scope() as session:
+            await session.execute(update(User).where(User.telegram_id == telegram_id).values(preferences=prefs))
+            await session.commit()
+    finally:
+        _invalidate_user(telegram_id)
+
+
+async def cycle_user_preference(telegram_id: int, key: str, options: list, default: str) -> str:
+    """Advance a preference to the next of `options` in one UPDATE … RETURNING, so concurrent taps each step once."""
+    prefs = func.coalesce(User.preferences, literal("{}", String))
+    cur   = func.coalesce(func.json_extract(prefs, f"$.{key}"), default)
+    nxt   = case({opt: options[(i + 1) % len(options)] for i, opt in enumerate(options)},
+                 value=cur, else_=options[0])
+    try:
+        async with session_scope() as session:
+            result = await session.execute(
+                update(User).where(User.telegram_id == telegram_id)
+                .values(preferences=func.json_set(prefs, f"$.{key}", nxt))
+                .returning(func.json_extract(User.preferences, f"$.{key}")))
+            new = result.scalar()
+            await session.commit()
+    finally:
+        _invalidate_user(telegram_id)
+    return new if new is not None else options[0]
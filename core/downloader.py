@@ -1,11 +1,24 @@
 import logging
-import urllib.request
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 
-from config import AUDIO_API, AUDIO_DIR, DOWNLOAD_TIMEOUT
+import httpx
+
+from config import AUDIO_API, AUDIO_DIR, DOWNLOAD_TIMEOUT, DOWNLOAD_WORKERS
 
 logger = logging.getLogger(__name__)
 
+# One pooled client shared by the download threads: consecutive ayas reuse the
+# same keep-alive TCP/TLS connection instead of a fresh handshake per file.
+_client = httpx.Client(
+    timeout=DOWNLOAD_TIMEOUT,
+    follow_redirects=True,
+    limits=httpx.Limits(max_connections=DOWNLOAD_WORKERS, max_keepalive_connections=DOWNLOAD_WORKERS),
+)
+_CHUNK = 64 * 1024
+
 def download_audio(voice: str, sura: int, aya: int) -> Path | None:
     url  = f"{AUDIO_API}/{voice}/{sura:03d}{aya:03d}.mp3"
     path = AUDIO_DIR / voice / str(sura) / f"{sura:03d}{aya:03d}.mp3"
@@ -13,15 +26,44 @@ def download_audio(voice: str, sura: int, aya: int) -> Path | None:
         return path
     path.parent.mkdir(parents=True, exist_ok=True)
     for attempt in range(3):
+        # A unique temp file per attempt, renamed into place only once complete, so two
+        # jobs fetching the same aya never interleave their bytes into one file.
+        fd, part = tempfile.mkstemp(dir=path.parent, prefix=f"{path.name}.", suffix=".part")
         try:
             logger.info(f"Downloading {sura}:{aya} (attempt {attempt+1})")
-            with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as r:
-                path.write_bytes(r.read())
+            with os.fdopen(fd, "wb") as f, _client.stream("GET", url) as r:
+                r.raise_for_status()
+                for chunk in r.iter_bytes(_CHUNK):
+                    f.write(chunk)
+            os.replace(part, path)
             return path
         except Exception as e:
             logger.warning(f"Download attempt {attempt+1} failed for {sura}:{aya}: {e}")
-            if path.exists():
-                path.unlink()
+            Path(part).unlink(missing_ok=True)
     return None
 
 
+def scan_sura_dir(audio_dir: Path, voice: str, sura: int) -> dict[str, os.DirEntry]:
+    """{filename: DirEntry} for one sura's cached ayas — one directory read instead of a stat per aya."""
+    try:
+        with os.scandir(audio_dir / voice / str(sura)) as it:
+            return {e.name: e for e in it}
+    except FileNotFoundError:
+        return {}
+
+
+def download_many(voice: str, refs: list[tuple[int, int]],
+                  max_workers: int = DOWNLOAD_WORKERS, progress_cb=None) -> dict[tuple[int, int], Path | None]:
+    """Download several ayas in parallel. Returns {(sura, aya): path or None}.
+
+    The fetches are network-bound, so a small thread pool overlaps the per-file
+    round-trips; progress_cb(done_count) is called as each file completes.
+    """
+    results: dict[tuple[int, int], Path | None] = {}
+    if not refs: return results
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(refs))) as pool:
+        futures = {pool.submit(download_audio, voice, sura, aya): (sura, aya) for sura, aya in refs}
+        for done, fut in enumerate(as_completed(futures), 1):
+            results[futures[fut]] = fut.result()
+            if progress_cb: progress_cb(done)
+    return results
@@ -18,7 +18,9 @@ from __future__ import annotations
 
 import logging
 import re
+from functools import lru_cache
 from io import BytesIO
+from itertools import accumulate
 
 from PIL import Image, ImageDraw, ImageFont, features
 from PIL.Image import Resampling
@@ -28,6 +30,7 @@ RAQM_AVAILABLE = features.check('raqm')
 from config import (
     DEFAULT_IMAGE_RESOLUTION,
     FONT_PATHS,
+    FONT_SETTINGS,
     IMAGE_BACKGROUNDS,
     IMAGE_DEFAULT_BG,
     IMAGE_DEFAULT_FONT,
@@ -40,15 +43,14 @@ logger = logging.getLogger(__name__)
 
 # ── Arabic-Indic numerals ─────────────────────────────────────────────────────
 
-_AR_DIGITS = "٠١٢٣٤٥٦٧٨٩"
+_AR_DIGITS = str.maketrans("0123456789", "٠١٢٣٤٥٦٧٨٩")
 
 def to_arabic(n: int) -> str:
     """Convert integer to Arabic-Indic digit string."""
-    return "".join(_AR_DIGITS[int(d)] for d in str(n))
+    return str(n).translate(_AR_DIGITS)
 
 def to_number(n: int, font_key: str) -> str:
     """Formatted verse number (style + optional brackets) per font."""
-    from config import FONT_SETTINGS
     cfg = FONT_SETTINGS.get(font_key, FONT_SETTINGS[IMAGE_DEFAULT_FONT])
     num = to_arabic(n) if cfg["num"] == "arabic" else str(n)
     return f"({num})" if cfg.get("brackets", True) else num
@@ -73,20 +75,16 @@ def basmala_for_font(verse_text: str, font_key: str) -> str:
 
 # ── Font cache ────────────────────────────────────────────────────────────────
 
-_font_cache: dict[tuple, ImageFont.FreeTypeFont] = {}
-
+@lru_cache(maxsize=128)   # a few fonts × the fit-loop sizes (and their SSAA doubles)
 def get_font(key: str, size: int, custom_path:str|None=None) -> ImageFont.FreeTypeFont:
-    ck = (key, size)
-    if ck not in _font_cache:
-        path = custom_path or FONT_PATHS.get(key, FONT_PATHS[IMAGE_DEFAULT_FONT])
+    path = custom_path or FONT_PATHS.get(key, FONT_PATHS[IMAGE_DEFAULT_FONT])
+    try:
+        return ImageFont.truetype(path, size)
+    except (IOError, OSError):
         try:
-            _font_cache[ck] = ImageFont.truetype(path, size)
+            return ImageFont.truetype(FONT_PATHS[IMAGE_DEFAULT_FONT], size)
         except (IOError, OSError):
-            try:
-                _font_cache[ck] = ImageFont.truetype(FONT_PATHS[IMAGE_DEFAULT_FONT], size)
-            except (IOError, OSError):
-                _font_cache[ck] = ImageFont.load_default()
-    return _font_cache[ck]
+            return ImageFont.load_default()
 
 
 # ── Text measurement ──────────────────────────────────────────────────────────
@@ -133,9 +131,10 @@ def wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_w: int) -> list[st
     min_wpl = MIN_WORDS_PER_LINE if n >= MIN_WORDS_PER_LINE else 1
     sp_w    = get_text_width(draw, " ", font)
     ww      = [get_text_width(draw, w, font) for w in words]
+    cum     = [0, *accumulate(ww)]   # cum[j] - cum[i] = width of words[i:j] without spaces
 
     def line_px(i, j):
-        return sum(ww[i:j]) + sp_w * max(0, j - i - 1)
+        return cum[j] - cum[i] + sp_w * max(0, j - i - 1)
 
     def try_k(k):
         if k > n or n < k * min_wpl:
@@ -183,22 +182,58 @@ def wrap_text(draw: ImageDraw.ImageDraw, text: str, font, max_w: int) -> list[st
     return lines
 
 
+def fit_text_lines(text: str, font_key: str, max_w: int, max_h: int,
+                   sizes: tuple = tuple(range(38, 23, -2)), line_ratio: float = 1.45) -> tuple[list[str], int]:
+    """Largest font size in `sizes` (descending) whose wrapped lines fit max_w × max_h.
+
+    The first size is tried directly (most verses fit); otherwise the remaining
+    sizes are bisected, since a smaller font never needs more room. Falls back to
+    the smallest size wrapped as one paragraph, like the old linear shrink loop.
+    """
+    draw = ImageDraw.Draw(Image.new("RGBA", (1, 1)))
+
+    def layout(fs):
+        font  = get_font(font_key, fs)
+        lines = []
+        for para in text.split("\n"):
+            pl = wrap_text(draw, para.strip(), font, max_w)
+            if any(get_text_width(draw, line, font) > max_w for line in pl):
+                return None
+            lines.extend(pl)
+        return lines if len(lines) * int(fs * line_ratio) <= max_h else None
+
+    best = layout(sizes[0])
+    if best is not None:
+        return best, sizes[0]
+    fs, lo, hi = None, 1, len(sizes) - 1
+    while lo <= hi:
+        mid   = (lo + hi) // 2
+        lines = layout(sizes[mid])
+        if lines is None:
+            lo = mid + 1
+        else:
+            best, fs, hi = lines, sizes[mid], mid - 1
+    if best is not None:
+        return best, fs
+    return wrap_text(draw, text, get_font(font_key, sizes[-1]), max_w), sizes[-1]
+
+
 # ── Verse text cleaner ────────────────────────────────────────────────────────
 
+_ANNOTATION_MARKS = re.compile(r'[\u06D6-\u06ED]')
+
 def clean_verse(text: str, font_key: str = IMAGE_DEFAULT_FONT) -> str:
     """
     Remove specific non-letter characters for cleaner visual display:
     - U+0670: Dagger Alif (pronunciation guide, often visually distracting in some fonts).
     - U+06D6-U+06ED: Quranic annotation marks (pause signs, small high letters etc.)
     """
-    from config import FONT_SETTINGS
     cfg = FONT_SETTINGS.get(font_key, FONT_SETTINGS[IMAGE_DEFAULT_FONT])
     if not cfg["clean"]:
         return text
 
     # text = re.sub(r'\u0670', '', text)
-    text = re.sub(r'[\u06D6-\u06ED]', '', text)
-    return text
+    return _ANNOTATION_MARKS.sub('', text)
 
 
 # ── Layout constants ──────────────────────────────────────────────────────────
@@ -3,6 +3,7 @@ import json
 from config import LOCALE_DIR
 
 _strings: dict = {}
+_EMPTY:   dict = {}
 
 def load_locales() -> None:
     global _strings
@@ -16,7 +17,12 @@ def load_locales() -> None:
 load_locales()
 
 def t(key: str, lang: str = "ar", **kwargs) -> str:
-    text = _strings.get(lang, _strings.get("ar", {})).get(key, key)
+    # _strings is already the per-language {key: text} table built at import;
+    # only resolve the Arabic fallback table when the language is unknown.
+    table = _strings.get(lang)
+    if table is None:
+        table = _strings.get("ar", _EMPTY)
+    text = table.get(key, key)
     if kwargs:
         try:
             return text.format(**kwargs)
@@ -3,15 +3,17 @@
 Pages are served from local PNG files:
     data/images/{source}/{page_num}.png     (1–604)
 
-Telegram file_ids are cached to avoid re-uploading:
-    data/images/{source}/ids.json           {"1": "file_id", ...}
+Telegram file_ids are cached to avoid re-uploading (kept in memory, persisted to):
+    data/{source}_pages.json                {"1": "file_id", ...}
 
 If the PNG file does not exist, sends a placeholder text message.
 """
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+from functools import lru_cache
 from pathlib import Path
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
@@ -19,6 +21,7 @@ from telegram import InlineKeyboardButton, InlineKeyboardMarkup, InputMediaPhoto
 from config import DATA_DIR, DEFAULT_PAGE_SOURCE, PAGE_SOURCES
 
 from .lang import t
+from .utils import NEXT_ARROW, PREV_ARROW, nav_button, write_json_atomic
 
 logger = logging.getLogger(__name__)
 
@@ -29,23 +32,33 @@ def _ids_path(source: str) -> Path:
     return DATA_DIR / f"{source}_pages.json"
 
 
+_ids_cache: dict[str, dict[str, str]] = {}   # source → {"page": file_id}, loaded once
+
+
 def _load_ids(source: str) -> dict[str, str]:
-    p = _ids_path(source)
+    ids = _ids_cache.get(source)
+    if ids is not None:
+        return ids
+    p   = _ids_path(source)
+    ids = {}
     if p.exists():
         try:
-            return json.loads(p.read_text(encoding="utf-8"))
+            ids = json.loads(p.read_text(encoding="utf-8"))
         except Exception:
-            return {}
-    return {}
+            ids = {}
+    _ids_cache[source] = ids
+    return ids
 
 
 def _save_id(source: str, page: int, file_id: str) -> None:
-    p = _ids_path(source)
-    p.parent.mkdir(parents=True, exist_ok=True)
     ids = _load_ids(source)
+    if ids.get(str(page)) == file_id:
+        return
     ids[str(page)] = file_id
+    p = _ids_path(source)
+    p.parent.mkdir(parents=True, exist_ok=True)
     try:
-        p.write_text(json.dumps(ids, ensure_ascii=False, indent=2), encoding="utf-8")
+        write_json_atomic(p, ids)
     except Exception as e:
         logger.warning("Could not save mushaf ids for %s: %s", source, e)
 
@@ -66,12 +79,13 @@ def page_available(source: str, page: int) -> bool:
 
 # ── Keyboard ──────────────────────────────────────────────────────────────────
 
+@lru_cache(maxsize=512)
 def _mushaf_kb(page: int, lang: str, source: str) -> InlineKeyboardMarkup:
     nav = []
     if page > 1:
-        nav.append(InlineKeyboardButton("⬅️", callback_data=f"mushaf_{source}_{page - 1}"))
+        nav.append(nav_button(PREV_ARROW, f"mushaf_{source}_{page - 1}"))
     if page < 604:
-        nav.append(InlineKeyboardButton("➡️", callback_data=f"mushaf_{source}_{page + 1}"))
+        nav.append(nav_button(NEXT_ARROW, f"mushaf_{source}_{page + 1}"))
     rows = []
     if nav:
         rows.append(nav)
@@ -125,14 +139,13 @@ async def send_mushaf_page(
             await query.message.reply_text(notice, reply_markup=kb)
         return
 
-    with open(img_path, "rb") as f:
-        media = InputMediaPhoto(media=f, caption=caption)
-        try:
-            sent_msg = await query.edit_message_media(media=media, reply_markup=kb)
-        except Exception:
-            sent_msg = await query.message.reply_photo(
-                photo=open(img_path, "rb"), caption=caption, reply_markup=kb
-            )
+    # Read off the event loop; the same bytes serve the reply fallback.
+    data  = await asyncio.to_thread(img_path.read_bytes)
+    media = InputMediaPhoto(media=data, caption=caption)
+    try:
+        sent_msg = await query.edit_message_media(media=media, reply_markup=kb)
+    except Exception:
+        sent_msg = await query.message.reply_photo(photo=data, caption=caption, reply_markup=kb)
 
     # Cache the file_id Telegram assigned
     try:
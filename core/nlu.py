@@ -4,17 +4,32 @@ import re
 from rapidfuzz import fuzz, process
 
 from .search import normalize_arabic
+from .utils import LRUCache
 
+# parse_message runs on every text message; compile its patterns once.
+_DIGIT_RE    = re.compile(r"\d")
+_NUMBERS_RE  = re.compile(r"\d+")
+_NUMSPLIT_RE = re.compile(r"(\d+)")   # split() → [text, number, text, number, …, text]
+_FILLER_RE   = re.compile(r"(FROM|SURAH|AYAH|VERSE|SURA|AYA)", re.IGNORECASE)
+_PAGE_RE     = re.compile(r"(page|صفحة)\s+(\d+)", re.IGNORECASE)
+_COLON_RE    = re.compile(r"(\d+):(\d+)(?:-(\d+))?")
+_FROM_TO_RE  = re.compile(r"(?P<f>from|من)\s+|(to|الي|إلي|حتي)\s+", re.IGNORECASE)
 
 def _build_sura_names(quran_data):
-    names = []
-    for i, entry in enumerate(quran_data["Sura"][1:], 1):
-        if len(entry) > 4:
-            names.append({"name": entry[4], "sura": i})
-            names.append({"name": normalize_arabic(entry[4]), "sura": i})
-        if len(entry) > 5:
-            names.append({"name": entry[5], "sura": i})
-    return names
+    """(choices, ASCII-only choices, name → sura, match memo) for fuzzy sura matching, built once per dataset."""
+    index = quran_data.get("_nlu_names")
+    if index is None:
+        sura_of = {}
+        for i, entry in enumerate(quran_data["Sura"][1:], 1):
+            if len(entry) > 4:
+                sura_of.setdefault(entry[4], i)
+                sura_of.setdefault(normalize_arabic(entry[4]), i)
+            if len(entry) > 5:
+                sura_of.setdefault(entry[5], i)
+        choices = tuple(sura_of)
+        index   = quran_data["_nlu_names"] = (
+            choices, tuple(c for c in choices if c.isascii()), sura_of, LRUCache(2048))
+    return index
 
 def _match_sura_name(text, sura_names):
     if not text.strip(): return None
@@ -22,19 +37,26 @@ def _match_sura_name(text, sura_names):
     # not a sura name. Sura names are 1-3 words max. Fuzzy-matching a full sentence
     # against short sura names produces false positives via partial_ratio.
     words = text.strip().split()
-    if len(words) > 3 and not re.search(r'\d', text):
+    if len(words) > 3 and not _DIGIT_RE.search(text):
         return None
-    best = process.extractOne(text, [x["name"] for x in sura_names], scorer=fuzz.WRatio)
-    if best and best[1] > 80:
-        m = next((x for x in sura_names if x["name"] == best[0]), None)
-        return m["sura"] if m else None
-    return None
+    choices, ascii_choices, sura_of, memo = sura_names
+    if text in sura_of:   # exact name: WRatio would score it 100 and pick it anyway
+        return sura_of[text]
+    if text in memo:   # users keep asking for the same few suras
+        return memo.get(text)
+    # ASCII text shares no letters with the Arabic names, so only the transliterations
+    # can score; score_cutoff lets rapidfuzz skip choices that cannot beat 80.
+    best = process.extractOne(text, ascii_choices if text.isascii() else choices, scorer=fuzz.WRatio, score_cutoff=80)
+    sura = sura_of[best[0]] if best and best[1] > 80 else None
+    memo.set(text, sura)
+    return sura
 
 def _parse_chunk(text, sura_names):
     if not text: return None
-    clean    = re.sub(r"(FROM|SURAH|AYAH|VERSE|SURA|AYA)", "", text, flags=re.IGNORECASE).strip()
-    numbers  = re.findall(r"\d+", clean)
-    txt_part = re.sub(r"\d+", "", clean).strip()
+    clean    = _FILLER_RE.sub("", text).strip()
+    parts    = _NUMSPLIT_RE.split(clean)
+    numbers  = parts[1::2]
+    txt_part = "".join(parts[::2]).strip()
     if not txt_part and numbers:
         sura = int(numbers[0])
         if not 1 <= sura <= 114: return None
@@ -44,14 +66,14 @@ def _parse_chunk(text, sura_names):
     return None
 
 def _detect_page(text):
-    m = re.search(r"(page|صفحة)\s+(\d+)", text, flags=re.IGNORECASE)
+    m = _PAGE_RE.search(text)
     if m:
         p = int(m.group(2))
         if 1 <= p <= 604: return {"type": "page", "page": p}
     return None
 
 def _detect_colon(original, sura_names):
-    m = re.search(r"(\d+):(\d+)(?:-(\d+))?", original)
+    m = _COLON_RE.search(original)
     if not m: return None
     s1, a1 = int(m.group(1)), int(m.group(2))
     a2     = int(m.group(3)) if m.group(3) else None
@@ -80,7 +102,7 @@ def _detect_range(normalized, sura_names):
     if p2.strip().isdigit(): return {"type": "range", "sura": sura, "from_aya": from_aya, "to_aya": int(p2.strip())}
     info2 = _parse_chunk(p2.strip(), sura_names)
     if info2 and info2.get("aya"): return {"type": "range", "sura": sura, "from_aya": from_aya, "to_aya": info2["aya"]}
-    nums = re.findall(r"\d+", p2)
+    nums = _NUMBERS_RE.findall(p2)
     if nums: return {"type": "range", "sura": sura, "from_aya": from_aya, "to_aya": int(nums[0])}
     return None
 
@@ -90,11 +112,15 @@ def _detect_single(normalized, sura_names):
     if info.get("aya"): return {"type": "aya", "sura": info["sura"], "aya": info["aya"]}
     return {"type": "surah", "sura": info["sura"]}
 
+def _from_to_keyword(m):
+    return "FROM " if m.group("f") else "TO "
+
 def parse_message(text: str, quran_data: dict) -> dict:
     original   = text.strip()
+    if _COLON_RE.fullmatch(original):   # bare "2:255" / "2:255-257": no name prefix to resolve
+        return _detect_colon(original, None)
     normalized = normalize_arabic(original)
-    keywords   = re.sub(r"(from|من)\s+",                       "FROM ", normalized, flags=re.IGNORECASE)
-    keywords   = re.sub(r"(to|الي|إلي|حتي)\s+",                        "TO ",   keywords,   flags=re.IGNORECASE)
+    keywords   = _FROM_TO_RE.sub(_from_to_keyword, normalized)
     names      = _build_sura_names(quran_data)
     return (
         _detect_page(keywords) or
@@ -1,9 +1,10 @@
 """
-queue.py — Serial request queue for audio/video generation.
+queue.py — Request queue for audio/video generation.
 
 Design:
   - Requests are stored in SQLite (RequestQueue table) so they survive restarts.
-  - An asyncio.Queue feeds a single consumer task (one job at a time).
+  - An asyncio.Queue feeds QUEUE_WORKERS consumer tasks (default 1 — one job
+    at a time). Handlers only enqueue, so they return to Telegram immediately.
   - When a job finishes the consumer sends the file to the user and
     updates the status message.
   - Cancel button removes the item if it hasn't started yet.
@@ -22,6 +23,8 @@ from datetime import datetime, timezone
 
 from sqlalchemy import Column, DateTime, Integer, String, Text, select
 
+from config import QUEUE_WORKERS
+
 from .database import Base, get_session
 
 logger = logging.getLogger(__name__)
@@ -49,18 +52,18 @@ class QueueItem(Base):
 
 class RequestQueue:
     """
-    Single-instance queue that processes audio/video jobs serially.
-    Call `start(bot)` once at bot startup.
+    Single-instance queue that processes audio/video jobs with `workers`
+    concurrent consumers. Call `start(bot)` once at bot startup.
     """
 
-    def __init__(self):
+    def __init__(self, workers: int = QUEUE_WORKERS):
+        self._workers = max(1, workers)
         self._queue: asyncio.Queue = asyncio.Queue()
         self._bot = None
         self._processor_fn = None   # injected from bot.py to avoid circular import
         self._cancelled_ids: set = set()  # fast in-memory cancel lookup
         self._lock = asyncio.Lock()
-        self._current_task: asyncio.Task | None = None
-        self._current_item_id: int | None = None
+        self._running: dict[int, asyncio.Task] = {}   # item_id → processing task
 
     def set_processor(self, fn):
         """fn(bot, item: QueueItem) → None  (async)"""
@@ -97,7 +100,8 @@ class RequestQueue:
 
         for item_id in pending_ids:
             await self._queue.put(item_id)
-        asyncio.create_task(self._consume())
+        for _ in range(self._workers):
+            asyncio.create_task(self._consume())
 
     async def enqueue(self, bot, user_id: int, chat_id: int,
                       request_type: str, params: dict, lang: str,
@@ -135,8 +139,9 @@ class RequestQueue:
 
             # If processing, cancel the task
             if item.status == "processing":
-                if self._current_item_id == item_id and self._current_task:
-                    self._current_task.cancel()
+                task = self._running.get(item_id)
+                if task:
+                    task.cancel()
                     logger.info("Cancelled processing task for item %d", item_id)
 
             item.status = "cancelled"
@@ -147,7 +152,7 @@ class RequestQueue:
             await session.close()
 
     async def cancel_all(self) -> int:
-        """Admin function to cancel all pending items AND stop the current processing one."""
+        """Admin function to cancel all pending items AND stop any processing ones."""
         async with self._lock:
             session = get_session()
             try:
@@ -158,8 +163,8 @@ class RequestQueue:
                 count = 0
                 for item in items:
                     if item.status == "processing":
-                        if self._current_item_id == item.id and self._current_task:
-                            self._current_task.cancel()
+                        task = self._running.get(item.id)
+                        if task: task.cancel()
                     item.status = "cancelled"
                     self._cancelled_ids.add(item.id)
                     count += 1
@@ -203,7 +208,6 @@ class RequestQueue:
                 continue
 
             item.status = "processing"
-            self._current_item_id = item_id
             await session.commit()
             await session.close()
 
@@ -212,8 +216,8 @@ class RequestQueue:
 
             try:
                 if self._processor_fn:
-                    self._current_task = asyncio.create_task(self._processor_fn(self._bot, item_id))
-                    await self._current_task
+                    task = self._running[item_id] = asyncio.create_task(self._processor_fn(self._bot, item_id))
+                    await task
             except asyncio.CancelledError:
                 logger.info("Task for item %d was cancelled", item_id)
                 await self._notify_cancelled(item_id)
@@ -223,8 +227,7 @@ class RequestQueue:
                 log_error(e, context="queue_processor", extra={"item_id": item_id})
                 await self._notify_error(item_id)
             finally:
-                self._current_task = None
-                self._current_item_id = None
+                self._running.pop(item_id, None)
 
             self._queue.task_done()
 
@@ -1,4 +1,25 @@
-import re
+from bisect import bisect_right
+from typing import NamedTuple
+
+from .data import _verse_locations, get_sura_aya_count, get_sura_start_index
+
+# One translate table for every per-character rule in normalize_arabic:
+#   0. dagger alif U+0670 removed (pronunciation mark, not a letter)
+#   1. alif variants إ أ آ ٱ → ا   (ٱ U+0671 alif wasla included)
+#   2. alif maksura ى → ي
+#   3. hamza seats ؤ ئ → ء
+#   4. tashkeel U+064B–U+065F removed
+#   5. Quranic annotation marks U+06D6–U+06ED removed (small high/low signs, pause
+#      marks, sajda mark, small waw/ya ۥ ۦ, etc.)
+#   6. tatweel (kashida) ـ removed
+#   7. zero-width characters removed
+_AR_NORMALIZE = str.maketrans(
+    {"إ": "ا", "أ": "ا", "آ": "ا", "ٱ": "ا", "ى": "ي", "ؤ": "ء", "ئ": "ء"}
+    | dict.fromkeys(
+        [0x0670, 0x0640, 0x200B, 0x200C, 0x200D, 0xFEFF,
+         *range(0x064B, 0x0660), *range(0x06D6, 0x06EE)]
+    )
+)
 
 
 def normalize_arabic(text: str) -> str:
@@ -17,39 +38,40 @@ def normalize_arabic(text: str) -> str:
     """
     if not text:
         return ""
+    if text.isascii():   # English queries: no table entry can match
+        return " ".join(text.lower().split())
+    # Steps 0–7 are all single-code-point maps/deletions, applied in one C-level pass;
+    # then collapse whitespace and lowercase non-Arabic.
+    return " ".join(text.translate(_AR_NORMALIZE).lower().split())
 
-    # 0. Remove dagger alif FIRST (U+0670) — pronunciation mark, not a letter
-    text = re.sub(r'\u0670', '', text)
 
-    # 1. Normalize alif variants → ا  (ٱ U+0671 alif wasla included)
-    text = re.sub(r'[إأآٱا]', 'ا', text)
+# Normalized copy of the last corpus searched (the bot only ever searches one),
+# joined with "\n" so a query — which never contains a newline — is located by
+# str.find in C; `starts` maps a match offset back to its verse index.
+_norm_corpus: tuple[list, str, list[int]] | None = None
 
-    # 2. Normalize alif maksura → ya
-    text = re.sub(r'ى', 'ي', text)
 
-    # 3. Normalize hamza seats
-    text = re.sub(r'[ؤئ]', 'ء', text)
+def _normalized(verses: list) -> tuple[str, list[int]]:
+    global _norm_corpus
+    if _norm_corpus is None or _norm_corpus[0] is not verses:
+        norm   = [normalize_arabic(v) for v in verses]
+        starts = [0] * len(norm)
+        pos    = 0
+        for i, v in enumerate(norm):
+            starts[i] = pos
+            pos += len(v) + 1
+        _norm_corpus = (verses, "\n".join(norm), starts)
+    return _norm_corpus[1], _norm_corpus[2]
 
-    # 4. Remove standard Arabic diacritics (tashkeel) U+064B–U+065F
-    text = re.sub(r'[\u064B-\u065F]', '', text)
 
-    # 5. Remove Quranic annotation marks U+06D6–U+06ED
-    #    (small high/low signs, pause marks, sajda mark, small waw/ya ۥ ۦ, etc.)
-    text = re.sub(r'[\u06D6-\u06ED]', '', text)
+class SearchHit(NamedTuple):
+    text: str
+    sura: int
+    aya:  int
+    page: int
 
-    # 6. Remove tatweel (kashida) ـ
-    text = re.sub(r'\u0640', '', text)
 
-    # 7. Remove zero-width characters
-    text = re.sub(r'[\u200B\u200C\u200D\uFEFF]', '', text)
-
-    # 8. Collapse whitespace, lowercase non-Arabic
-    text = re.sub(r'\s+', ' ', text).lower().strip()
-
-    return text
-
-
-def search(quran_data: dict, verses: list, query: str) -> list:
+def search(quran_data: dict, verses: list, query: str) -> list[SearchHit]:
     if len(query) < 3:
         return []
 
@@ -57,37 +79,56 @@ def search(quran_data: dict, verses: list, query: str) -> list:
     if not norm_query:
         return []
 
+    corpus, starts = _normalized(verses)
     results = []
-    for i, verse in enumerate(verses):
-        if norm_query in normalize_arabic(verse):
-            sura, aya = get_location(quran_data, i)
-            page = get_page(quran_data, sura, aya)
-            results.append({
-                "text": verse,
-                "sura": sura,
-                "aya":  aya,
-                "page": page,
-            })
+    i   = -1
+    pos = corpus.find(norm_query)
+    while pos != -1:
+        i = bisect_right(starts, pos, i + 1) - 1
+        sura, aya = get_location(quran_data, i)
+        page = get_page(quran_data, sura, aya)
+        results.append(SearchHit(verses[i], sura, aya, page))
+        if i + 1 >= len(starts):
+            break
+        pos = corpus.find(norm_query, starts[i + 1])   # one hit per verse
     return results
 
 
 def get_location(quran_data: dict, verse_index: int) -> tuple[int, int]:
-    for sura_num in range(1, len(quran_data["Sura"])):
-        start = int(quran_data["Sura"][sura_num][0])
-        count = int(quran_data["Sura"][sura_num][1])
-        if start <= verse_index < start + count:
-            return sura_num, verse_index - start + 1
+    locations = _verse_locations(quran_data)
+    if 0 <= verse_index < len(locations):
+        return locations[verse_index]
     return 1, 1
 
 
+def _page_starts(quran_data: dict) -> tuple[list[tuple[int, int]], list[int]]:
+    """Sorted (sura, aya) page starts and their positions in quran_data["Page"], built once."""
+    table = quran_data.get("_page_starts")
+    if table is None:
+        rows  = [(i, (p[0], p[1])) for i, p in enumerate(quran_data.get("Page", [])) if p and len(p) >= 2]
+        table = quran_data["_page_starts"] = ([k for _, k in rows], [i for i, _ in rows])
+    return table
+
+
+def _bisect_page(quran_data: dict, sura: int, aya: int) -> int:
+    keys, positions = _page_starts(quran_data)
+    k = bisect_right(keys, (sura, aya))
+    return positions[k] - 1 if k < len(keys) else 604
+
+
+def _verse_pages(quran_data: dict) -> tuple[int, ...]:
+    """Page number per global verse index, built once from the page starts."""
+    pages = quran_data.get("_verse_pages")
+    if pages is None:
+        pages = quran_data["_verse_pages"] = tuple(_bisect_page(quran_data, s, a)
+                                                   for s, a in _verse_locations(quran_data))
+    return pages
+
+
 def get_page(quran_data: dict, sura: int, aya: int) -> int:
-    for page_num, page_data in enumerate(quran_data.get("Page", []), 1):
-        if not page_data or len(page_data) < 2:
-            continue
-        p_sura, p_aya = page_data[0], page_data[1]
-        if p_sura > sura or (p_sura == sura and p_aya > aya):
-            return page_num - 2
-    return 604
+    if 1 <= sura <= 114 and 1 <= aya <= get_sura_aya_count(quran_data, sura):
+        return _verse_pages(quran_data)[get_sura_start_index(quran_data, sura) + aya - 1]
+    return _bisect_page(quran_data, sura, aya)
 
 
 def make_snippet(verse: str, query: str, context_words: int = 4) -> str:
@@ -2,31 +2,52 @@
 import json
 import logging
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from config import FFPROBE_BIN
 
+from .downloader import scan_sura_dir
+
 logger = logging.getLogger(__name__)
 
+_PROBE_WORKERS = 8
+
+# Per-aya source MP3s never change once downloaded, so a probed length is reused
+# for every later SRT/LRC/video request that touches the same aya. A plain dict
+# (one float per aya file ever probed) keeps it safe to fill from probe threads.
+_durations: dict[str, float] = {}   # path → seconds
+
 def probe_duration(path: Path) -> float:
+    key = str(path)
+    cached = _durations.get(key)
+    if cached is not None:
+        return cached
     try:
         r = subprocess.run(
-            [FFPROBE_BIN, "-v", "quiet", "-print_format", "json", "-show_streams", str(path)],
+            [FFPROBE_BIN, "-v", "quiet", "-print_format", "json", "-show_streams", "-select_streams", "a", key],
             capture_output=True,
         )
         data = json.loads(r.stdout)
         for s in data.get("streams", []):
             if s.get("codec_type") == "audio":
-                return float(s.get("duration", 0))
+                d = float(s.get("duration", 0))
+                if d > 0: _durations[key] = d
+                return d
     except Exception as e:
         logger.warning(f"ffprobe failed for {path}: {e}")
     return 0.0
 
 def get_verse_durations(audio_dir: Path, voice: str, sura: int, start_aya: int, end_aya: int) -> list[float]:
-    return [
-        probe_duration(p) if (p := audio_dir / voice / str(sura) / f"{sura:03d}{aya:03d}.mp3").exists() else 0.0
-        for aya in range(start_aya, end_aya + 1)
-    ]
+    """Durations in seconds for each aya (0.0 if its MP3 is missing); uncached files are probed in parallel."""
+    present = scan_sura_dir(audio_dir, voice, sura)
+    entries = [present.get(f"{sura:03d}{aya:03d}.mp3") for aya in range(start_aya, end_aya + 1)]
+    paths   = [e.path for e in entries if e is not None]
+    if not paths:
+        return [0.0] * len(entries)
+    with ThreadPoolExecutor(max_workers=min(_PROBE_WORKERS, len(paths))) as pool:
+        probed = dict(zip(paths, pool.map(probe_duration, paths)))
+    return [probed[e.path] if e is not None else 0.0 for e in entries]
 
 def _srt_ts(s: float) -> str:
     ms = int(round(s * 1000))
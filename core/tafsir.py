@@ -2,64 +2,95 @@
 
 Cache hierarchy:
   1. In-memory LRU
-  2. SQLite DB (persistent across restarts, 30-day TTL)
+  2. SQLite DB (persistent across restarts, 30-day TTL; written behind in batches)
   3. AlQuran.cloud API
 """
 import asyncio
-import json
 import logging
-import urllib.request
 from datetime import datetime, timedelta, timezone
 
+import httpx
+
 from config import DEFAULT_TAFSIR, DOWNLOAD_TIMEOUT, QURAN_API, TAFSIR_SOURCES
 
 from .utils import LRUCache
 
 logger    = logging.getLogger(__name__)
-_mem      = LRUCache(max_size=500)
+_mem      = LRUCache(max_size=10_000)   # tafsir texts are small; keep a process-lifetime working set
 CACHE_TTL = timedelta(days=30)
 
+# A range request fans out one API call per aya; they share one keep-alive
+# client and at most _API_CONCURRENCY are in flight, to stay polite to the API.
+_API_CONCURRENCY = 8
+_api_sem         = asyncio.Semaphore(_API_CONCURRENCY)
+_client: httpx.AsyncClient | None = None
+
 
 async def _db_get(key: str) -> str | None:
+    """One indexed SELECT; rows past CACHE_TTL are ignored here and removed by purge_expired_tafsir()."""
     try:
-        from .database import TafsirCache, get_session, select
-        s   = get_session()
-        result = await s.execute(select(TafsirCache).filter_by(cache_key=key))
-        row = result.scalars().first()
-        if row:
-            age = datetime.now(timezone.utc) - row.created_at.replace(tzinfo=timezone.utc)
-            if age < CACHE_TTL:
-                await s.close()
-                return row.text
-            from sqlalchemy import delete
-            await s.execute(delete(TafsirCache).filter_by(cache_key=key))
-            await s.commit()
-        await s.close()
+        from .database import TafsirCache, select, session_scope
+        stmt = (select(TafsirCache.text)
+                .where(TafsirCache.cache_key == key,
+                       TafsirCache.created_at >= datetime.now(timezone.utc) - CACHE_TTL)
+                .limit(1))
+        async with session_scope() as s:
+            return (await s.scalars(stmt)).first()
     except Exception as e:
         logger.warning("DB tafsir read: %s", e)
     return None
 
 
-async def _db_set(key: str, text: str) -> None:
-    try:
-        from .database import TafsirCache, get_session, select
-        s   = get_session()
-        result = await s.execute(select(TafsirCache).filter_by(cache_key=key))
-        row = result.scalars().first()
-        if row:
-            row.text = text; row.created_at = datetime.now(timezone.utc)
-        else:
-            s.add(TafsirCache(cache_key=key, text=text))
+async def purge_expired_tafsir() -> int:
+    """Delete tafsir rows older than CACHE_TTL in one statement; returns the row count."""
+    from sqlalchemy import delete
+
+    from .database import TafsirCache, session_scope
+    async with session_scope() as s:
+        result = await s.execute(
+            delete(TafsirCache).where(TafsirCache.created_at < datetime.now(timezone.utc) - CACHE_TTL))
         await s.commit()
-        await s.close()
-    except Exception as e:
-        logger.warning("DB tafsir write: %s", e)
+    return result.rowcount or 0
+
+
+# Write-behind: fetched texts are queued and flushed shortly after, so the
+# reply never waits on SQLite and a range request lands as one upsert.
+_WRITE_DELAY = 1.0
+_pending: dict[str, str] = {}
+_flush_task: asyncio.Task | None = None
 
 
-def _fetch_sync(url: str):
-    """Blocking network fetch."""
-    with urllib.request.urlopen(url, timeout=DOWNLOAD_TIMEOUT) as r:
-        return json.loads(r.read())
+def _db_set(key: str, text: str) -> None:
+    global _flush_task
+    _pending[key] = text
+    if _flush_task is None or _flush_task.done():
+        _flush_task = asyncio.create_task(_flush_pending())
+
+
+async def _flush_pending() -> None:
+    from .database import upsert_tafsir
+    await asyncio.sleep(_WRITE_DELAY)
+    while _pending:
+        items = list(_pending.items())
+        _pending.clear()
+        try:
+            await upsert_tafsir(items)
+        except Exception as e:
+            logger.warning("DB tafsir write: %s", e)
+
+
+async def _fetch(url: str) -> dict:
+    global _client
+    if _client is None:
+        _client = httpx.AsyncClient(
+            timeout=DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=_API_CONCURRENCY),
+        )
+    async with _api_sem:
+        r = await _client.get(url)
+    r.raise_for_status()
+    return r.json()
 
 
 async def get_tafsir(sura: int, aya: int, source: str = "muyassar") -> str | None:
@@ -78,14 +109,18 @@ async def get_tafsir(sura: int, aya: int, source: str = "muyassar") -> str | Non
 
     url = f"{QURAN_API}/ayah/{sura}:{aya}/editions/quran-uthmani,{edition}"
     try:
-        loop = asyncio.get_event_loop()
-        data = await loop.run_in_executor(None, _fetch_sync, url)
+        data = await _fetch(url)
         if data.get("data") and len(data["data"]) > 1:
             text = data["data"][1].get("text", "")
             _mem.set(key, text)
-            await _db_set(key, text)
+            _db_set(key, text)
             return text
     except Exception as e:
         logger.warning("Tafsir API failed %s:%s: %s", sura, aya, e)
 
     return None
+
+
+async def get_tafsir_range(sura: int, start: int, end: int, source: str = "muyassar") -> list[str | None]:
+    """Tafsir for ayas start..end of a sura, looked up concurrently (cache → DB → API)."""
+    return list(await asyncio.gather(*(get_tafsir(sura, aya, source) for aya in range(start, end + 1))))
@@ -1,11 +1,19 @@
 """utils.py — Shared utility functions for QBot."""
+import asyncio
 import logging
+import os
 import shutil
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from pathlib import Path
 
-from config import PURGE_THRESHOLD_MB, RATE_MAX_REQUESTS, RATE_WINDOW_SECONDS, WARN_THRESHOLD_MB
+from config import (
+    EDIT_DEBOUNCE_SECONDS,
+    PURGE_THRESHOLD_MB,
+    RATE_MAX_REQUESTS,
+    RATE_WINDOW_SECONDS,
+    WARN_THRESHOLD_MB,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,17 +30,34 @@ async def delete_status_msg(msg) -> None:
 def get_free_mb(path: Path) -> float:
     return shutil.disk_usage(path).free / (1024 * 1024)
 
+def _scan_files(directory) -> list[os.DirEntry]:
+    """Every regular file under `directory`; DirEntry caches the stat data used for sorting and sizing."""
+    out, stack = [], [directory]
+    while stack:
+        try:
+            with os.scandir(stack.pop()) as it:
+                for e in it:
+                    if e.is_dir(follow_symlinks=False): stack.append(e.path)
+                    elif e.is_file(follow_symlinks=False): out.append(e)
+        except OSError: pass
+    return out
+
 def _purge_dir_by_mtime(directory: Path, target_free_mb: float) -> int:
     if not directory.exists(): return 0
-    files = sorted([f for f in directory.rglob("*") if f.is_file()], key=lambda f: f.stat().st_mtime)
+    files = sorted(_scan_files(directory), key=lambda e: e.stat().st_mtime)
+    # One statvfs up front; freed bytes are counted instead of re-querying per file.
+    need    = (target_free_mb - get_free_mb(directory)) * 1024 * 1024
     deleted = 0
     for f in files:
-        if get_free_mb(directory) >= target_free_mb: break
-        try: f.unlink(); deleted += 1; logger.info(f"Purged: {f}")
-        except Exception as e: logger.warning(f"Could not delete {f}: {e}")
-    for d in sorted(directory.rglob("*"), reverse=True):
-        if d.is_dir():
-            try: d.rmdir()
+        if need <= 0: break
+        try:
+            size = f.stat().st_size
+            os.unlink(f.path); deleted += 1; need -= size; logger.info(f"Purged: {f.path}")
+        except Exception as e: logger.warning(f"Could not delete {f.path}: {e}")
+    # Bottom-up walk yields children before parents, so nested empty dirs collapse in one pass.
+    for root, dirs, _ in os.walk(directory, topdown=False):
+        for d in dirs:
+            try: os.rmdir(os.path.join(root, d))
             except OSError: pass
     return deleted
 
@@ -47,18 +72,20 @@ def check_and_purge_storage(*dirs: Path) -> None:
         total = sum(_purge_dir_by_mtime(d, PURGE_THRESHOLD_MB * 1.5) for d in dirs)
         logger.info(f"Purge complete. Deleted {total} file(s).")
 
-_rate_store: dict[int, list[float]] = {}
+_rate_store: dict[int, deque[float]] = {}
 _rate_prune_counter = 0
 
 def is_rate_limited(telegram_id: int) -> bool:
     global _rate_prune_counter
     now = time.monotonic()
-    ts = [t for t in _rate_store.get(telegram_id, []) if now - t < RATE_WINDOW_SECONDS]
+    ts  = _rate_store.get(telegram_id)
+    if ts is None:
+        ts = _rate_store[telegram_id] = deque()
+    while ts and now - ts[0] >= RATE_WINDOW_SECONDS:   # timestamps are appended in order
+        ts.popleft()
     if len(ts) >= RATE_MAX_REQUESTS:
-        _rate_store[telegram_id] = ts
         return True
     ts.append(now)
-    _rate_store[telegram_id] = ts
     # Prune dead entries every 500 calls to prevent unbounded dict growth
     _rate_prune_counter += 1
     if _rate_prune_counter >= 500:
@@ -85,6 +112,85 @@ class LRUCache:
         return key in self._store
 
 
+# ---------------------------------------------------------------------------
+# Coalesced menu edits
+# Menu handlers hand their new text to debounced_edit() and return at once.
+# One worker task per (chat_id, message_id) sends the edits: a lone tap goes
+# out immediately, later ones wait until EDIT_DEBOUNCE_SECONDS after the
+# previous edit, and only the newest pending state is sent, so a burst of
+# taps on a toggle or list page becomes a single editMessageText.
+#
+# Telegram answers edit floods with RetryAfter; the chat is then held back for
+# that long instead of every later edit hitting the same 429. All of this
+# waiting happens in the worker, never in the handler.
+# ---------------------------------------------------------------------------
+from telegram.error import BadRequest, RetryAfter
+
+_edit_pending: dict[tuple, tuple]        = {}   # key → (query, text, kwargs), newest unsent edit
+_edit_workers: dict[tuple, asyncio.Task] = {}   # key → task draining _edit_pending[key]
+_edit_state   = LRUCache(2000)   # key → (sent_at, text, reply_markup) of the last edit sent
+_chat_backoff = LRUCache(2000)   # chat_id → monotonic time Telegram asked us to wait until
+
+def _retry_seconds(err: RetryAfter) -> float:
+    ra = err.retry_after
+    return ra.total_seconds() if hasattr(ra, "total_seconds") else float(ra)
+
+def debounced_edit(query, text: str, **kwargs) -> None:
+    """Schedule a menu edit; it replaces any edit for the same message that has not gone out yet."""
+    msg = query.message
+    key = (msg.chat_id, msg.message_id) if msg is not None else (None, query.inline_message_id)
+    _edit_pending[key] = (query, text, kwargs)
+    if key not in _edit_workers:
+        _edit_workers[key] = asyncio.create_task(_edit_worker(key))
+
+async def _edit_worker(key: tuple) -> None:
+    chat_id = key[0]
+    try:
+        while key in _edit_pending:
+            last = _edit_state.get(key)
+            wait = max(last[0] + EDIT_DEBOUNCE_SECONDS if last else 0.0,
+                       _chat_backoff.get(chat_id) or 0.0) - time.monotonic()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                continue
+            query, text, kwargs = _edit_pending.pop(key)
+            target = (text, kwargs.get("reply_markup"))
+            # The tap's message snapshot can predate an edit we already sent, so skip only
+            # when it and our own record of the last edit both show the target already.
+            msg = query.message
+            if (msg is not None and (msg.text, msg.reply_markup) == target
+                    and (last is None or last[1:] == target)):
+                continue
+            try:
+                await query.edit_message_text(text, **kwargs)
+                _edit_state.set(key, (time.monotonic(), *target))
+            except RetryAfter as e:
+                delay = _retry_seconds(e)
+                _chat_backoff.set(chat_id, time.monotonic() + delay)
+                logger.info("Edit throttled for chat %s: retry after %.0fs", chat_id, delay)
+                _edit_pending.setdefault(key, (query, text, kwargs))
+            except BadRequest as e:
+                if "not modified" in str(e): _edit_state.set(key, (time.monotonic(), *target))
+                else: logger.warning("Menu edit failed for %s: %s", key, e)
+            except Exception as e:
+                logger.warning("Menu edit failed for %s: %s", key, e)
+    finally:
+        _edit_workers.pop(key, None)
+
+
+# ---------------------------------------------------------------------------
+# Shared navigation buttons
+# Not cached: callback data carries pages, offsets and search text, so nearly
+# every (label, callback_data) pair is unique and a cache would only pin them.
+# ---------------------------------------------------------------------------
+from telegram import InlineKeyboardButton as _Button
+
+PREV_ARROW, NEXT_ARROW = "⬅️", "➡️"
+
+def nav_button(label: str, data: str) -> _Button:
+    return _Button(label, callback_data=data)
+
+
 # ---------------------------------------------------------------------------
 # Telegram file_id permanent cache  (OUTPUT_DIR/file_ids.json)
 # Keyed by stable string: "audio:{voice}:{sura}:{start}:{end}"
@@ -94,6 +200,14 @@ import json as _json
 
 from config import OUTPUT_DIR as _OUTPUT_DIR
 
+
+def write_json_atomic(path: Path, data) -> None:
+    """Dump `data` to a sibling .tmp file and os.replace it over `path` — readers never see a half-written file."""
+    tmp = path.with_name(path.name + ".tmp")
+    tmp.write_text(_json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
 _FILE_ID_PATH = _OUTPUT_DIR / "file_ids.json"
 _file_ids: dict = {}
 
@@ -110,10 +224,7 @@ def _load_file_ids() -> None:
 def _save_file_ids() -> None:
     try:
         _OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-        _FILE_ID_PATH.write_text(
-            _json.dumps(_file_ids, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        write_json_atomic(_FILE_ID_PATH, _file_ids)
     except Exception as e:
         logger.warning("Could not save file_ids.json: %s", e)
 
@@ -121,6 +232,7 @@ def get_file_id(key: str) -> str | None:
     return _file_ids.get(key)
 
 def set_file_id(key: str, file_id: str) -> None:
+    if _file_ids.get(key) == file_id: return
     _file_ids[key] = file_id
     _save_file_ids()
 
@@ -202,9 +314,6 @@ def log_error(
         if len(entries) > _MAX_ERRORS:
             entries = entries[-_MAX_ERRORS:]   # keep newest
 
-        _ERRORS_PATH.write_text(
-            _json.dumps(entries, ensure_ascii=False, indent=2),
-            encoding="utf-8",
-        )
+        write_json_atomic(_ERRORS_PATH, entries)
     except Exception as e:
         logger.warning("Could not write errors.json: %s", e)
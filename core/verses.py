@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import logging
+import re
+from functools import lru_cache
 from io import BytesIO
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup
@@ -14,6 +16,7 @@ from config import (
 from .data import (
     get_sura_display_name,
     get_sura_start_index,
+    get_sura_verses,
     replace_basmala_symbol,
     strip_basmala,
 )
@@ -26,7 +29,7 @@ from .image import (
 from .lang import t
 from .search import get_page
 from .subtitles import build_lrc, build_srt
-from .utils import safe_filename
+from .utils import NEXT_ARROW, PREV_ARROW, LRUCache, get_file_id, nav_button, safe_filename, set_file_id
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +48,11 @@ def build_verse_keyboard(
     verse_char_len: int = 0,   # kept for API compat, no longer gates image
 ) -> InlineKeyboardMarkup:
     """Main aya keyboard: text / tafsir / audio / more."""
+    return _verse_keyboard(sura, start, end, lang)
+
+
+@lru_cache(maxsize=2048)
+def _verse_keyboard(sura, start, end, lang) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
         [InlineKeyboardButton(t("text",   lang), callback_data=f"text_{sura}_{start}_{end}")],
         [InlineKeyboardButton(t("tafsir", lang), callback_data=f"tafsir_{sura}_{start}_{end}")],
@@ -62,9 +70,13 @@ def build_more_keyboard(sura, start, end, lang, quran_data,
       - multiple ayas AND total chars ≤ IMAGE_CHARS_LIMIT
     No paging — one image or nothing.
     """
-    page      = get_page(quran_data, sura, start)
     aya_count = end - start + 1
     show_img  = (aya_count == 1) or (verse_chars > 0 and verse_chars <= IMAGE_CHARS_LIMIT)
+    return _more_keyboard(sura, start, end, lang, get_page(quran_data, sura, start), show_img)
+
+
+@lru_cache(maxsize=2048)
+def _more_keyboard(sura, start, end, lang, page, show_img) -> InlineKeyboardMarkup:
     rows = []
     if show_img:
         rows.append([InlineKeyboardButton(t("image", lang), callback_data=f"img_{sura}_{start}_{end}")])
@@ -87,23 +99,45 @@ def format_verse_file(fmt, verse_pairs, durations=None, title="", artist="") ->
     if fmt == "lrc": return build_lrc(verse_pairs, durations, title=title, artist=artist)
     return ""
 
-async def send_file(message, content: str, fmt: str, base_name: str, lang: str = "ar") -> None:
+async def send_file(message, content: str, fmt: str, base_name: str, lang: str = "ar",
+                    fid_key: str | None = None) -> None:
     filename = f"{base_name}.{fmt}"
     bio = BytesIO(content.encode("utf-8")); bio.name = filename
-    await message.reply_document(document=bio, caption=t("file_caption", lang, filename=filename))
+    sent = await message.reply_document(document=bio, caption=t("file_caption", lang, filename=filename))
+    if fid_key and sent and sent.document:
+        set_file_id(fid_key, sent.document.file_id)
+
+async def send_cached_file(message, fid_key: str | None, fmt: str, base_name: str, lang: str = "ar") -> bool:
+    """Resend a previously uploaded document by file_id. Returns False on a cache miss."""
+    cached = get_file_id(fid_key) if fid_key else None
+    if not cached: return False
+    await message.reply_document(document=cached, caption=t("file_caption", lang, filename=f"{base_name}.{fmt}"))
+    return True
+
+_AYA_END = re.compile("﴾")
+
+def paginate_text(text: str, limit: int = CHAR_LIMIT) -> list[str]:
+    """Split text after aya ends (﴾) into pages shorter than `limit`, as slices of the original.
+
+    An aya longer than `limit` on its own still gets a page to itself.
+    """
+    cuts = [m.end() for m in _AYA_END.finditer(text)]
+    if not cuts or cuts[-1] != len(text): cuts.append(len(text))
+    pages, start, prev = [], 0, 0
+    for cut in cuts:
+        if cut - start >= limit and prev > start:
+            pages.append(text[start:prev]); start = prev
+        prev = cut
+    pages.append(text[start:])
+    return [p for p in pages if p.strip()]
 
 async def send_paged_message(message, text: str, reply_markup=None) -> None:
     if len(text) <= CHAR_LIMIT:
         await message.reply_text(text, reply_markup=reply_markup); return
-    parts, current_msg = text.split("﴾"), ""
-    for part in parts:
-        if not part.strip(): continue
-        chunk = part + "﴾"
-        if len(current_msg + chunk) < CHAR_LIMIT: current_msg += chunk
-        else:
-            if current_msg: await message.reply_text(current_msg)
-            current_msg = chunk
-    if current_msg: await message.reply_text(current_msg, reply_markup=reply_markup)
+    pages = paginate_text(text)
+    for page in pages[:-1]:
+        await message.reply_text(page)
+    if pages: await message.reply_text(pages[-1], reply_markup=reply_markup)
 
 
 # ── Image text builder ────────────────────────────────────────────────────────
@@ -154,9 +188,10 @@ def _build_img_text(page_pairs: list, sura: int, font_key: str) -> str:
 
 # ── Image page nav keyboard ───────────────────────────────────────────────────
 
+@lru_cache(maxsize=1024)
 def build_img_keyboard(sura, start, end, lang) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup([
-        [InlineKeyboardButton(t("back", lang), callback_data=f"verse_back_{sura}_{start}_{end}")],
+        [nav_button(t("back", lang), f"verse_back_{sura}_{start}_{end}")],
     ])
 
 
@@ -200,7 +235,7 @@ async def send_img_page(
 
 # ── Single-verse text send ────────────────────────────────────────────────────
 
-async def send_text_single(query, sura, aya, user, lang, verses, quran_data, durations=None):
+async def send_text_single(query, sura, aya, user, lang, verses, quran_data, durations=None, fid_key=None):
     fmt       = user.get_preference("text_format", "msg")
     sura_name = get_sura_display_name(quran_data, sura, lang)
     idx       = get_sura_start_index(quran_data, sura)
@@ -208,9 +243,10 @@ async def send_text_single(query, sura, aya, user, lang, verses, quran_data, dur
     title      = f"{sura_name} ({aya})"
 
     if fmt in ("srt", "lrc"):
+        if await send_cached_file(query.message, fid_key, fmt, safe_filename(title), lang): return
         stripped = strip_basmala(verse_text, sura, aya)
         content  = format_verse_file(fmt, [(aya, stripped)], durations=durations, title=title, artist="")
-        await send_file(query.message, content, fmt, safe_filename(title), lang)
+        await send_file(query.message, content, fmt, safe_filename(title), lang, fid_key=fid_key)
         return
 
     # msg format — basmala outside the bracket
@@ -221,9 +257,7 @@ async def send_text_single(query, sura, aya, user, lang, verses, quran_data, dur
     else:
         response = f"📖 {title}\n\n﴿ {display} ({aya}) ﴾"
 
-    back_kb = InlineKeyboardMarkup([[InlineKeyboardButton(
-        t("back", lang), callback_data=f"verse_back_{sura}_{aya}_{aya}"
-    )]])
+    back_kb = InlineKeyboardMarkup([[nav_button(t("back", lang), f"verse_back_{sura}_{aya}_{aya}")]])
     if len(response) <= CHAR_LIMIT:
         await query.edit_message_text(response, reply_markup=back_kb)
     else:
@@ -232,22 +266,36 @@ async def send_text_single(query, sura, aya, user, lang, verses, quran_data, dur
 
 # ── Range text send ───────────────────────────────────────────────────────────
 
-async def send_text_range(query, sura, start, end, char_offset, user, lang, verses, quran_data, durations=None):
+# Joined display body per range; each ⬅️/➡️ page tap slices the same string.
+_range_body_cache = LRUCache(256)
+
+
+def _range_body(verses, quran_data, sura, start, end) -> str:
+    key  = (id(verses), sura, start, end)
+    body = _range_body_cache.get(key)
+    if body is None:
+        texts = get_sura_verses(quran_data, verses, sura, start, end)
+        body  = " ".join(f"{replace_basmala_symbol(v, sura, i)} ({i})" for i, v in enumerate(texts, start))
+        _range_body_cache.set(key, body)
+    return body
+
+
+async def send_text_range(query, sura, start, end, char_offset, user, lang, verses, quran_data,
+                          durations=None, fid_key=None):
     fmt       = user.get_preference("text_format", "msg")
     sura_name = get_sura_display_name(quran_data, sura, lang)
-    idx       = get_sura_start_index(quran_data, sura)
     title     = f"{sura_name} ({start}-{end})"
-    raw_pairs = [(i, verses[idx + i - 1]) for i in range(start, end + 1)]
 
     if fmt in ("srt", "lrc"):
-        strip_pairs = [(i, strip_basmala(v, sura, i)) for i, v in raw_pairs]
+        if await send_cached_file(query.message, fid_key, fmt, safe_filename(title), lang): return
+        texts       = get_sura_verses(quran_data, verses, sura, start, end)
+        strip_pairs = [(i, strip_basmala(v, sura, i)) for i, v in enumerate(texts, start)]
         content     = format_verse_file(fmt, strip_pairs, durations=durations, title=title, artist="")
-        await send_file(query.message, content, fmt, safe_filename(title), lang)
+        await send_file(query.message, content, fmt, safe_filename(title), lang, fid_key=fid_key)
         return
 
     # msg format — basmala outside bracket on first page
-    verse_pairs     = [(i, replace_basmala_symbol(v, sura, i)) for i, v in raw_pairs]
-    full_body       = " ".join(f"{vt} ({i})" for i, vt in verse_pairs)
+    full_body       = _range_body(verses, quran_data, sura, start, end)
     leading_basmala = full_body.startswith(_BASMALA_SYMBOL)
     if leading_basmala:
         full_body = full_body[len(_BASMALA_SYMBOL):].lstrip()
@@ -271,12 +319,12 @@ async def send_text_range(query, sura, start, end, char_offset, user, lang, vers
     shown = header + body_slice + footer
     nav   = []
     if char_offset > 0:
-        nav.append(InlineKeyboardButton("⬅️", callback_data=f"textpage_{sura}_{start}_{end}_{max(0, char_offset - CHAR_LIMIT)}"))
+        nav.append(nav_button(PREV_ARROW, f"textpage_{sura}_{start}_{end}_{max(0, char_offset - CHAR_LIMIT)}"))
     if next_off < len(full_body):
-        nav.append(InlineKeyboardButton("➡️", callback_data=f"textpage_{sura}_{start}_{end}_{next_off}"))
+        nav.append(nav_button(NEXT_ARROW, f"textpage_{sura}_{start}_{end}_{next_off}"))
     kb = InlineKeyboardMarkup(
         ([nav] if nav else []) +
-        [[InlineKeyboardButton(t("back", lang), callback_data=f"verse_back_{sura}_{start}_{end}")]]
+        [[nav_button(t("back", lang), f"verse_back_{sura}_{start}_{end}")]]
     )
 
     if len(shown) <= CHAR_LIMIT:
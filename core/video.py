@@ -15,10 +15,16 @@ Ratio (landscape/portrait) controls output resolution from VIDEO_SIZES.
 Progress callback: gen_video accepts progress_cb(pct: int, msg: str).
 """
 
+import hashlib
 import json
 import logging
+import os
+import random
 import subprocess
 import tempfile
+import threading
+from functools import lru_cache
+from io import BytesIO
 from pathlib import Path
 
 from config import (
@@ -34,17 +40,28 @@ from config import (
 )
 
 from .image import clean_verse, to_number
+from .utils import LRUCache
 
 logger = logging.getLogger(__name__)
 
 _VIDEO_TEXT_COLOR = (255, 255, 255, 255)
 
+# Encoded verse frames, reused when the same range is rendered again with
+# another reciter or audio (the frame does not depend on the voice).
+# Renders run on several media threads and LRUCache is a bare OrderedDict, so
+# every get/set goes through _frame_lock; rendering itself stays unlocked.
+_frame_cache = LRUCache(max_size=256)   # ~10–30 KB per PNG
+_frame_lock  = threading.Lock()
 
+
+@lru_cache(maxsize=1)
 def _detect_hw_encoder() -> tuple[str, list[str]]:
     """Probe available hardware H.264 encoders in priority order.
 
     Returns (encoder_name, extra_args) so the caller can swap in
     ``-c:v encoder_name *extra_args`` for the final output pass.
+    Runs on the first video, not at import; one ``ffmpeg -encoders`` listing
+    filters out encoders this build lacks before any trial encode is spawned.
 
     Priority:
       1. h264_nvenc  — NVIDIA (CUDA)
@@ -57,10 +74,16 @@ def _detect_hw_encoder() -> tuple[str, list[str]]:
         ("h264_vaapi",        ["-vf", "format=nv12,hwupload", "-rc_mode", "CQP", "-global_quality", "23"]),
         ("h264_videotoolbox", ["-q:v", "65"]),
     ]
-    import subprocess as _sp
+    try:
+        listed = subprocess.run([FFMPEG_BIN, "-hide_banner", "-encoders"],
+                                capture_output=True, text=True, timeout=10).stdout
+    except Exception:
+        listed = ""
     for enc, extra in candidates:
+        if enc not in listed:
+            continue
         try:
-            r = _sp.run(
+            r = subprocess.run(
                 [FFMPEG_BIN, "-hide_banner", "-loglevel", "error",
                  "-f", "lavfi", "-i", "color=black:size=16x16:rate=1:duration=0.1",
                  "-frames:v", "1", "-c:v", enc, "-f", "null", "-"],
@@ -74,10 +97,6 @@ def _detect_hw_encoder() -> tuple[str, list[str]]:
     return "libx264", ["-preset", "fast", "-crf", "23"]
 
 
-# Detected once at module load (thread-safe: GIL + read-only after init)
-_HW_ENC, _HW_ENC_ARGS = _detect_hw_encoder()
-
-
 # _render_frame has been moved to core/video_templates/
 
 def _build_entries(verses_list: list, start_aya: int, verse_durations: list,
@@ -126,12 +145,43 @@ def _probe_audio_duration(path: Path):
     return None
 
 
-# ── Output filename — only ratio bit now ─────────────────────────────────────
+# ── Background folder ─────────────────────────────────────────────────────────
+
+_BG_MEDIA_EXTS = frozenset({'.jpg', '.png', '.jpeg', '.mp4', '.mov'})
+
+def _pick_background(folder: str) -> str | None:
+    """Uniformly random media file in `folder`: one scandir pass, reservoir of one, no list."""
+    pick, seen = None, 0
+    try:
+        with os.scandir(folder) as it:
+            for e in it:
+                if os.path.splitext(e.name)[1].lower() in _BG_MEDIA_EXTS and e.is_file():
+                    seen += 1
+                    if random.randrange(seen) == 0:
+                        pick = e.path
+    except OSError:
+        return None
+    return pick
+
 
-def _out_filename(voice, sura, range_start, range_end, ratio, bg_key, font_key) -> str:
+# ── Output filename — ratio bit, plus a style tag for non-default renders ────
+
+_DEFAULT_STYLE = ("default", "theme", "", None, 0, (0, 0, 0, 255))
+
+
+def _out_filename(voice, sura, range_start, range_end, ratio, bg_key, font_key, *,
+                  template="default", bg_mode="theme", bg_path="", text_color=None,
+                  stroke_width=0, stroke_color=(0, 0, 0, 255)) -> str:
     ratio_bit = 0 if ratio == "landscape" else 1
     range_id  = f"{sura:03d}{range_start:03d}{range_end:03d}"
-    return f"{voice}_{range_id}_{ratio_bit}_{bg_key[:3]}_{font_key[:3]}.mp4"
+    name      = f"{voice}_{range_id}_{ratio_bit}_{bg_key[:3]}_{font_key[:3]}"
+    # The bot always renders the default style, so its cached names stay as they were;
+    # any other template/background/colours gets its own file instead of a stale hit.
+    style = (template, bg_mode, str(bg_path),
+             tuple(text_color) if text_color else None, stroke_width, tuple(stroke_color))
+    if style != _DEFAULT_STYLE:
+        name += f"_{bg_mode[:1]}{hashlib.blake2s(repr(style).encode(), digest_size=4).hexdigest()}"
+    return name + ".mp4"
 
 
 # ── Main pipeline ─────────────────────────────────────────────────────────────
@@ -156,12 +206,13 @@ def gen_video(
     stroke_width: int       = 0,
     stroke_color: tuple     = (0,0,0,255),
     template: str           = "default",
+    force: bool             = False,
 ) -> Path:
     """
     Generate a video for the given verses.
     Always: black background, white text, no border.
     Ratio controls output dimensions (landscape/portrait).
-    Returns the path to the output .mp4 (cached if already exists).
+    Returns the path to the output .mp4 (cached if already exists; force=True re-renders).
     """
     range_start = start_aya
     range_end   = start_aya + len(verses_list) - 1
@@ -174,25 +225,30 @@ def gen_video(
     size   = VIDEO_SIZES.get(ratio, VIDEO_SIZES[VIDEO_DEFAULT_RATIO])
     vw, vh = size
 
-    entries    = _build_entries(verses_list, start_aya, verse_durations, sura=sura, font_key=font_key)
-    text_total = entries[-1]["end"] if entries else 10.0
-
-    audio_dur = None
-    if audio_path and Path(audio_path).exists():
-        audio_dur = _probe_audio_duration(Path(audio_path))
-    total_dur = audio_dur if audio_dur and audio_dur > 0 else text_total
-
     if output_dir is None:
         output_dir = Path(tempfile.gettempdir())
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    out_name = _out_filename(voice, sura, range_start, range_end, ratio, bg_key, font_key)
-    out_path = output_dir / out_name
+    out_name = _out_filename(voice, sura, range_start, range_end, ratio, bg_key, font_key,
+                             template=template, bg_mode=bg_mode, bg_path=bg_path, text_color=text_color,
+                             stroke_width=stroke_width, stroke_color=stroke_color)
+    out_path  = output_dir / out_name
 
-    if out_path.exists() and out_path.stat().st_size > 0:
+    # A "folder" background is picked at random per render, so asking again means a new video.
+    if not force and bg_mode != "folder" and out_path.exists() and out_path.stat().st_size > 0:
+        out_path.touch()
         _progress(100, "cached")
         return out_path
 
+    # Only needed to build a new video — a cache hit above skips the ffprobe spawn.
+    entries    = _build_entries(verses_list, start_aya, verse_durations, sura=sura, font_key=font_key)
+    text_total = entries[-1]["end"] if entries else 10.0
+
+    audio_dur = None
+    if audio_path and Path(audio_path).exists():
+        audio_dur = _probe_audio_duration(Path(audio_path))
+    total_dur = audio_dur if audio_dur and audio_dur > 0 else text_total
+
     _progress(0, "rendering frames…")
 
     with tempfile.TemporaryDirectory() as _tmp:
@@ -217,10 +273,19 @@ def gen_video(
         pngs = []
         n    = len(entries)
         for idx, entry in enumerate(entries):
-            img = tmpl_mod.render_verse_frame(text=entry["text"], size=size, font_key=font_key, bg_key=bg_key, text_color=text_color, stroke_width=stroke_width, stroke_color=stroke_color)
             p   = tmp / f"verse_{idx:04d}.png"
-            img.save(str(p))
-            img.close()          # free PIL memory immediately
+            key = (tmpl_mod.__name__, entry["text"], size, font_key, bg_key, text_color, stroke_width, stroke_color)
+            with _frame_lock:
+                png = _frame_cache.get(key)
+            if png is None:
+                img = tmpl_mod.render_verse_frame(text=entry["text"], size=size, font_key=font_key, bg_key=bg_key, text_color=text_color, stroke_width=stroke_width, stroke_color=stroke_color)
+                buf = BytesIO()
+                img.save(buf, format="PNG")
+                img.close()      # free PIL memory immediately
+                png = buf.getvalue()
+                with _frame_lock:
+                    _frame_cache.set(key, png)
+            p.write_bytes(png)
             pngs.append((p, entry["end"] - entry["start"]))
             _progress(int(20 * (idx + 1) / n), f"frame {idx+1}/{n}")
 
@@ -270,13 +335,10 @@ def gen_video(
 
         # Handle "folder" by picking a random media (permanent for now)
         if bg_mode == "folder" and bg_path:
-            import random
-            folder = Path(bg_path)
-            media_files = [p for p in folder.iterdir() if p.is_file() and p.suffix.lower() in ('.jpg','.png','.jpeg','.mp4','.mov')]
-            if media_files:
-                choice = random.choice(media_files)
-                bg_path = str(choice)
-                if choice.suffix.lower() in ('.mp4', '.mov'):
+            choice = _pick_background(bg_path)
+            if choice:
+                bg_path = choice
+                if os.path.splitext(choice)[1].lower() in ('.mp4', '.mov'):
                     bg_mode = "video"
                 else:
                     bg_mode = "image"
@@ -330,16 +392,26 @@ def gen_video(
             f"[bg][txt]overlay=0:0:format=auto,trim=0:{total_dur:.4f},setpts=PTS-STARTPTS[vout]",
         ])
 
-        _run([
-            *inputs_args,
-            "-filter_complex", "; ".join(filters),
-            "-map", "[vout]",
-            *(["-map", f"{idx_audio}:a"] if has_audio else []),
-            "-c:v", _HW_ENC, *_HW_ENC_ARGS, "-pix_fmt", "yuv420p",
-            *(["-c:a", "aac", "-b:a", "128k"] if has_audio else []),
-            "-t", str(total_dur),
-            str(out_path),
-        ])
+        hw_enc, hw_args = _detect_hw_encoder()
+        # Encode to a per-call temp name beside the target and rename it in, so concurrent
+        # renders of the same video never share a file and a crash leaves no truncated MP4.
+        fd, part = tempfile.mkstemp(dir=output_dir, prefix=f"{out_path.stem}.", suffix=".part.mp4")
+        os.close(fd)
+        try:
+            _run([
+                *inputs_args,
+                "-filter_complex", "; ".join(filters),
+                "-map", "[vout]",
+                *(["-map", f"{idx_audio}:a"] if has_audio else []),
+                "-c:v", hw_enc, *hw_args, "-pix_fmt", "yuv420p",
+                *(["-c:a", "aac", "-b:a", "128k"] if has_audio else []),
+                "-t", str(total_dur),
+                part,
+            ])
+            os.replace(part, out_path)
+        except BaseException:
+            Path(part).unlink(missing_ok=True)
+            raise
 
         _progress(100, "done")
 
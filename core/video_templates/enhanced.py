@@ -5,7 +5,7 @@ from PIL import ImageDraw as PILDraw
 
 from config import CUSTOM_FONT_PATH, IMAGE_DEFAULT_BG, IMAGE_TEXT_COLORS, USERNAME
 from config import VIDEO_PADDING as PADDING
-from core.image import draw_arabic_line, get_font, get_text_width, wrap_text
+from core.image import draw_arabic_line, fit_text_lines, get_font, get_text_width
 
 # Supersample factor: render at Nx and downscale with LANCZOS for smooth edges.
 SSAA = 2
@@ -18,37 +18,7 @@ def render_verse_frame(text: str, size: tuple, font_key: str, bg_key: str, text_
     fg    = text_color if text_color else IMAGE_TEXT_COLORS.get(bg_key, IMAGE_TEXT_COLORS[IMAGE_DEFAULT_BG])
 
     # ── Pick font size + wrapping at target scale (fit check) ──────────
-    fs = 38
-    chosen_lines = []
-    chosen_fs    = 38
-
-    while fs >= 24:
-        probe = PILImage.new("RGBA", (1, 1))
-        draw_probe  = PILDraw.Draw(probe)
-        font  = get_font(font_key, fs)
-        lines, ok = [], True
-        for para in text.split("\n"):
-            pl = wrap_text(draw_probe, para.strip(), font, max_w)
-            for line in pl:
-                if get_text_width(draw_probe, line, font) > max_w:
-                    ok = False; break
-            if not ok: break
-            lines.extend(pl)
-        if ok:
-            line_h = int(fs * 1.45)
-            if len(lines) * line_h <= max_h:
-                chosen_lines = lines
-                chosen_fs = fs
-                break
-        fs -= 2
-
-    if not chosen_lines:
-        fs = 24
-        font = get_font(font_key, fs)
-        probe = PILImage.new("RGBA", (1, 1))
-        draw_probe  = PILDraw.Draw(probe)
-        chosen_lines = wrap_text(draw_probe, text, font, max_w)
-        chosen_fs = fs
+    chosen_lines, chosen_fs = fit_text_lines(text, font_key, max_w, max_h)
 
     # ── Render at SSAA× then downscale with LANCZOS for smooth edges ────
     sw, sh   = fixed_w * SSAA, fixed_h * SSAA
@@ -21,7 +21,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
 import config
 from core.audio import gen_mp3
-from core.data import get_sura_start_index, load_quran_data, load_quran_text
+from core.data import get_sura_verses, load_quran_data, load_quran_text
 from core.subtitles import get_verse_durations
 from core.utils import check_and_purge_storage
 from core.video import gen_video
@@ -85,8 +85,7 @@ def generate_one(quran_data, verses, sura, start_aya, end_aya, voice):
     title = f"Sura {sura}"
     mp3 = gen_mp3(AUDIO_DIR, OUTPUT_DIR, quran_data, voice,
                   sura, start_aya, sura, end_aya, title=title, artist=voice)
-    start_idx = get_sura_start_index(quran_data, sura)
-    vtexts = [verses[start_idx + i - 1] for i in range(start_aya, end_aya + 1)]
+    vtexts = get_sura_verses(quran_data, verses, sura, start_aya, end_aya)
     vdurs = get_verse_durations(AUDIO_DIR, voice, sura, start_aya, end_aya)
     return gen_video(
         vtexts, start_aya, sura,
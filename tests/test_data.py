@@ -1,9 +1,15 @@
 """Tests for core.data — basmala handling and sura metadata helpers."""
+from pathlib import Path
+
+import json5
+
 from core.data import (
+    _loads_js,
     get_sura_aya_count,
     get_sura_display_name,
     get_sura_name,
     get_sura_start_index,
+    get_sura_verses,
     replace_basmala_symbol,
     strip_basmala,
 )
@@ -48,3 +54,23 @@ def test_sura_metadata_roundtrip(quran_data):
     display = get_sura_display_name(quran_data, 1, lang="en")
     assert display.startswith("Surah")
     assert get_sura_display_name(quran_data, 112, lang="ar").startswith("سورة")
+
+
+def test_sura_offsets_match_raw_rows(quran_data):
+    # The cached tables must agree with the Tanzil rows for every sura.
+    for sura in range(1, 115):
+        row = quran_data["Sura"][sura]
+        assert get_sura_start_index(quran_data, sura) == int(row[0])
+        assert get_sura_aya_count(quran_data, sura) == int(row[1])
+
+
+def test_get_sura_verses_is_contiguous_slice(quran_data, verses):
+    # Al-Baqarah 1..5 are the five verses right after Al-Fatiha's seven.
+    assert get_sura_verses(quran_data, verses, 2, 1, 5) == verses[7:12]
+    assert get_sura_verses(quran_data, verses, 1, 7, 7) == [verses[6]]
+
+
+def test_fast_js_parse_matches_json5():
+    text = (Path(__file__).resolve().parent.parent / "data" / "quran-data.json").read_text(encoding="utf-8")
+    assert _loads_js(text) == json5.loads(text)
+    assert _loads_js("{'a': 'it\\'s', /* c */ \"b\": [1, 2,], // x\n}") == {"a": "it's", "b": [1, 2]}
@@ -1,5 +1,5 @@
 """Tests for core.search — Arabic normalization and full-text search."""
-from core.search import make_snippet, normalize_arabic, search
+from core.search import get_location, make_snippet, normalize_arabic, search
 
 
 def test_normalize_collapses_alif_variants():
@@ -25,8 +25,8 @@ def test_search_finds_known_phrase(simple_verses, quran_data):
     # "الحمد لله" (Alhamdulillah) appears in Al-Fatiha aya 2 (aya 1 is the basmala).
     results = search(quran_data, simple_verses, "الحمد لله")
     assert results
-    assert all("sura" in r and "aya" in r for r in results)
-    assert results[0]["sura"] == 1 and results[0]["aya"] == 2
+    assert results[0].sura == 1 and results[0].aya == 2
+    assert results[0].page == 1
 
 
 def test_make_snippet_highlights_match():
@@ -39,3 +39,11 @@ def test_make_snippet_fallback_when_no_match():
     verse = "الحمد لله رب العالمين"
     snip = make_snippet(verse, "zzznotfound")
     assert snip == verse[:120]
+
+
+def test_get_location_sura_boundaries(quran_data):
+    # Verse indices are 0-based over the whole text: 0 → 1:1, 7 → 2:1 (Al-Fatiha has 7 ayas).
+    assert get_location(quran_data, 0) == (1, 1)
+    assert get_location(quran_data, 6) == (1, 7)
+    assert get_location(quran_data, 7) == (2, 1)
+    assert get_location(quran_data, 6235) == (114, 6)
@@ -0,0 +1,16 @@
+"""Tests for core.verses.paginate_text — long text split at aya boundaries."""
+from core.verses import paginate_text
+
+
+def test_paginate_keeps_ayas_whole_and_text_intact():
+    text  = " ".join(f"﴿ {'ب' * 30} ({i}) ﴾" for i in range(1, 21))
+    pages = paginate_text(text, limit=100)
+    assert len(pages) > 1
+    assert "".join(pages) == text
+    assert all(len(p) < 100 and p.endswith("﴾") for p in pages)
+
+
+def test_paginate_oversized_aya_gets_own_page():
+    long_aya = f"﴿ {'ب' * 150} ﴾"
+    pages = paginate_text(f"﴿ ا ﴾{long_aya}﴿ ج ﴾", limit=100)
+    assert pages == ["﴿ ا ﴾", long_aya, "﴿ ج ﴾"]
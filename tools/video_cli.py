@@ -11,9 +11,9 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
-from config import AUDIO_DIR, DATA_DIR, FONT_PATHS, OUTPUT_DIR, VIDEO_TOOL_DEFAULTS, VOICES
+from config import AUDIO_DIR, DATA_DIR, FONT_PATHS, OUTPUT_DIR, VIDEO_TOOL_DEFAULTS, VOICE_KEYS
 from core.audio import gen_mp3
-from core.data import get_sura_start_index, load_quran_data, load_quran_text_simple
+from core.data import get_sura_verses, load_quran_data, load_quran_text_simple
 from core.subtitles import get_verse_durations
 from core.video import _out_filename as get_video_filename
 from core.video import gen_video
@@ -22,8 +22,7 @@ QURAN_DATA = load_quran_data(DATA_DIR)
 VERSES_SIMPLE = load_quran_text_simple(DATA_DIR)
 
 def get_verses(sura, start, end):
-    idx = get_sura_start_index(QURAN_DATA, sura)
-    return [VERSES_SIMPLE[idx + aya - 1] for aya in range(start, end + 1)]
+    return get_sura_verses(QURAN_DATA, VERSES_SIMPLE, sura, start, end)
 
 def hex_to_rgba(hex_color):
     hex_color = hex_color.lstrip('#')
@@ -41,7 +40,7 @@ async def main():
     parser.add_argument("selection", nargs="?", help="Selection: 'sura' (e.g. 1), 'sura:aya' (e.g. 1:1), or 'sura:start-end' (e.g. 1:1-7)")
 
     # Style
-    parser.add_argument("-v", "--voice", default=d["voice"], choices=list(VOICES.keys()), help="Reciter voice")
+    parser.add_argument("-v", "--voice", default=d["voice"], choices=VOICE_KEYS, help="Reciter voice")
     parser.add_argument("-f", "--font", default=d["font"], choices=list(FONT_PATHS.keys()), help="Font key")
     parser.add_argument("-t", "--template", default=d["template"], choices=["default", "enhanced"], help="Render template")
 
@@ -15,9 +15,9 @@ from tkinter import colorchooser, filedialog, messagebox, ttk
 ROOT = Path(__file__).resolve().parent.parent
 sys.path.append(str(ROOT))
 
-from config import AUDIO_DIR, DATA_DIR, FONT_PATHS, OUTPUT_DIR, VIDEO_SETTINGS_FILE, VIDEO_TOOL_DEFAULTS, VOICES
+from config import AUDIO_DIR, DATA_DIR, FONT_PATHS, OUTPUT_DIR, VIDEO_SETTINGS_FILE, VIDEO_TOOL_DEFAULTS, VOICE_KEYS
 from core.audio import gen_mp3
-from core.data import get_sura_start_index, load_quran_data, load_quran_text_simple
+from core.data import get_sura_verses, load_quran_data, load_quran_text_simple
 from core.subtitles import get_verse_durations
 from core.video import _out_filename as get_video_filename
 from core.video import gen_video
@@ -26,8 +26,7 @@ QURAN_DATA = load_quran_data(DATA_DIR)
 VERSES_SIMPLE = load_quran_text_simple(DATA_DIR)
 
 def get_verses(sura, start, end):
-    idx = get_sura_start_index(QURAN_DATA, sura)
-    return [VERSES_SIMPLE[idx + aya - 1] for aya in range(start, end + 1)]
+    return get_sura_verses(QURAN_DATA, VERSES_SIMPLE, sura, start, end)
 
 
 class VideoGenApp(tk.Tk):
@@ -233,7 +232,7 @@ class VideoGenApp(tk.Tk):
         reciter_frame.pack(fill=tk.X, padx=10, pady=10)
 
         ttk.Label(reciter_frame, text="Voice:").grid(row=0, column=0, padx=5, pady=5, sticky=tk.E)
-        voices = list(VOICES.keys())
+        voices = list(VOICE_KEYS)
         cb = ttk.Combobox(reciter_frame, textvariable=self.voice_var, values=voices, state="readonly", width=35)
         cb.grid(row=0, column=1, padx=5, pady=5, sticky=tk.W)
 